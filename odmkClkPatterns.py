@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header begin-----------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+# __::((odmkClkPatterns.py))::__
+
+# Euclidean / polyrhythm pattern engine on top of odmkClocks
+#
+# a batch of P patterns is rendered in one pass to a COO style event list:
+# (patternIdx, sampleIdx) int64 arrays sorted by pattern then sample
+#
+# pattern p => k[p] onsets spread over n[p] steps, rotated by rotation[p],
+#              one cycle lasts cycleBars[p] bars of the clock, odd steps are
+#              delayed by swing[p] of a step, each onset is kept with
+#              probability prob[p]
+#
+# usage:
+# >>patIdx, smplIdx = odmkClkPatterns.clkPatterns(myOdmkClks, k=[3, 5, 4], n=[8, 16, 4])
+# >>xPat = odmkClkPatterns.clkPatternEvents(patIdx, smplIdx, myOdmkClks.totalSamples)
+#
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header end-------------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+import numpy as np
+
+import odmkClocks as clks
+import odmkMathUtil as mathutil
+
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# begin : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+# // *---------------------------------------------------------------------* //
+# // *---step masks
+# // *---------------------------------------------------------------------* //
+
+def euclidOnset(stepIdx, k, n, rotation=0):
+    ''' True where step stepIdx of the Euclidean rhythm E(k, n) rotated left
+        by rotation steps is an onset - all arguments broadcast
+        step i (after rotation) is an onset when (i * k) mod n < k, which
+        spreads the k onsets as evenly as possible (Bjorklund) '''
+
+    k = np.asarray(k, dtype=np.int64)
+    n = np.asarray(n, dtype=np.int64)
+    stepRot = (np.asarray(stepIdx, dtype=np.int64) + rotation) % n
+    return (stepRot * k) % n < k
+
+
+def euclidMask(k, n, rotation=0):
+    ''' batched Euclidean step masks
+        k, n, rotation => scalars or length P arrays
+        returns a (P, max(n)) bool array, steps beyond n[p] are False '''
+
+    k, n, rotation = np.broadcast_arrays(np.atleast_1d(k), np.atleast_1d(n), np.atleast_1d(rotation))
+    stepIdx = np.arange(n.max())
+    stepMask = euclidOnset(stepIdx[None, :], k[:, None], n[:, None], rotation[:, None])
+
+    return stepMask & (stepIdx[None, :] < n[:, None])
+
+
+# // *---------------------------------------------------------------------* //
+# // *---batched pattern render
+# // *---------------------------------------------------------------------* //
+
+def clkPatterns(clk, k, n, rotation=0, cycleBars=1, swing=0.0, prob=1.0, seed='None', numSamples='None'):
+    ''' render a batch of patterns against an odmkClocks object
+        clk => odmkClocks - steps lie on the clock's own clkDivNBeat(n)
+               grid (clkDivNToSample), so a legacy clock steps by
+               ceil(samplesPerBar / n) like its generators
+        k, n, rotation => Euclidean onsets / steps / rotation per pattern
+        cycleBars => bars per pattern cycle (integer), ex. n=[3, 4] with
+                     cycleBars=1 is a 3:4 polyrhythm, n=7 with cycleBars=2
+                     spreads 7 steps over 2 bars
+        swing => fraction of a step that odd steps are delayed (0 - 1)
+        prob => probability that each onset is kept (seed => int seed or
+                np.random.Generator, reproducible when given)
+        numSamples => render length (default clk.totalSamples)
+        all per pattern arguments broadcast to P patterns
+        returns (patternIdx, sampleIdx) int64 arrays sorted by pattern then
+        sample '''
+
+    if numSamples == 'None':
+        numSamples = clk.totalSamples
+
+    k, n, rotation, cycleBars, swing, prob = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(k, dtype=np.int64)), np.atleast_1d(np.asarray(n, dtype=np.int64)),
+        np.atleast_1d(np.asarray(rotation, dtype=np.int64)), np.atleast_1d(np.asarray(cycleBars, dtype=np.int64)),
+        np.atleast_1d(np.asarray(swing, dtype=np.float64)), np.atleast_1d(np.asarray(prob, dtype=np.float64)))
+    nPat = len(k)
+
+    # steps of each pattern needed to cover numSamples on its bar / n grid
+    # (+2 for the +/-1 gridAt estimate, +1 for the swing step length of
+    # the final step)
+    gridK = np.zeros(nPat, dtype=np.int64)
+    for nDiv in np.unique(n):
+        gridK[n == nDiv] = int(clk.clkGrid('divNBeat', int(nDiv))[1](numSamples)) + 2
+    patSteps = -((-gridK) // cycleBars) + 1
+
+    # flat (pattern, step) grid for all patterns at once
+    patIdx = np.repeat(np.arange(nPat), patSteps)
+    stepIdx = np.arange(len(patIdx)) - np.repeat(np.cumsum(patSteps) - patSteps, patSteps)
+
+    # step j of pattern p is event j * cycleBars[p] of the n[p] grid
+    stepSample = clk.clkDivNToSample(stepIdx * cycleBars[patIdx], n[patIdx])
+
+    # swing: delay odd steps by a fraction of their own step length
+    stepLast = np.append(stepIdx[1:] == 0, True)
+    stepLength = np.append(np.diff(stepSample), 0)
+    stepLength[stepLast] = 0
+    swingStep = (stepIdx % 2 == 1) & ~stepLast
+    stepSample[swingStep] += np.floor(swing[patIdx][swingStep] * stepLength[swingStep] + 0.5).astype(np.int64)
+
+    evtMask = euclidOnset(stepIdx, k[patIdx], n[patIdx], rotation[patIdx]) & ~stepLast & (stepSample < numSamples)
+    if np.any(prob < 1.0):
+        clkRng = mathutil.rngGen(seed)
+        evtMask &= clkRng.random(len(evtMask)) < prob[patIdx]
+
+    return patIdx[evtMask], stepSample[evtMask]
+
+
+def clkPolyrhythm(clk, divisions, cycleBars=1, numSamples='None'):
+    ''' polyrhythm - every step of each division is an onset
+        ex. clkPolyrhythm(myOdmkClks, [3, 4, 5]) => 3:4:5 against the bar '''
+
+    divisions = np.atleast_1d(divisions)
+    return clkPatterns(clk, divisions, divisions, cycleBars=cycleBars, numSamples=numSamples)
+
+
+def clkPatternsFromClocks(xClks, clkDtype='None'):
+    ''' (patternIdx, sampleIdx) event list of a list of clock trains in any
+        odmkClocks representation (odmkClkEvents, dense float / bool /
+        uint8, or bit-packed with clkDtype='packed') - lets generator
+        clocks join a pattern batch '''
+
+    clkIdx = [clks.clkEventIdx(xClk, clkDtype) for xClk in xClks]
+    patIdx = np.repeat(np.arange(len(clkIdx)), [len(evt) for evt in clkIdx])
+    if not clkIdx:
+        return patIdx.astype(np.int64), np.zeros(0, dtype=np.int64)
+
+    return patIdx.astype(np.int64), np.concatenate(clkIdx).astype(np.int64)
+
+
+def clkPatternEvents(patIdx, sampleIdx, numSamples, nPat='None'):
+    ''' split a (patternIdx, sampleIdx) event list into a list of
+        odmkClkEvents, one per pattern '''
+
+    if nPat == 'None':
+        nPat = int(patIdx.max()) + 1 if len(patIdx) else 0
+    patSplit = np.searchsorted(patIdx, np.arange(1, nPat))
+
+    return [clks.odmkClkEvents(patEvt, numSamples) for patEvt in np.split(sampleIdx, patSplit)]
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
@@ -15,8 +15,11 @@
 # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
 # *****************************************************************************
 
-import random
+import math
+from fractions import Fraction
 import numpy as np
+
+import odmkMathUtil as mathutil
 # import scipy as sp
 
 
@@ -33,21 +36,167 @@ import numpy as np
 
 
 def cyclicZn(n):
-    ''' calculates the Zn roots of unity '''
-    cZn = np.zeros((n, 1))*(0+0j)    # column vector of zero complex values
-    for k in range(n):
-        # z(k) = e^(((k)*2*pi*1j)/n)                         # Define cyclic group Zn points
-        cZn[k] = np.cos(((k)*2*np.pi)/n) + np.sin(((k)*2*np.pi)/n)*1j    # Euler's identity
-    return cZn
-
-
-def randomIdx(n, k):
-    '''for an array of k elements, returns a list of random indexes
-       of length n (n integers rangin from 0:k-1)'''
-    randIdx = []
-    for i in range(n):
-        randIdx.append(round(random.random()*(k-1)))
-    return randIdx
+    ''' calculates the Zn roots of unity
+        (n, 1) read-only view of the shared odmkMathUtil table '''
+    return mathutil.cyclicZn(n)
+
+
+def randomIdx(n, k, rng='None'):
+    '''for an array of k elements, returns an array of random indexes
+       of length n (n integers rangin from 0:k-1)
+       rng => seed or np.random.Generator (odmkMathUtil.rngGen)'''
+    return mathutil.randomIdx(n, k, rng)
+
+
+# // *********************************************************************** //
+# // *---pulse train kernel
+# // *********************************************************************** //
+
+def clkFraction(x):
+    ''' exact rational value of a number as written (29.97 => 2997/100) '''
+
+    if isinstance(x, Fraction):
+        return x
+    return Fraction(str(x))
+
+
+def clkIntFits(*intMax):
+    ''' True when every intermediate bound fits an int64 '''
+
+    return all(abs(int(x)) < 2**63 for x in intMax)
+
+
+def clkRoundMul(k, period):
+    ''' round half up of k * period (int64 array k, Fraction period), exact
+        and overflow-free: k * floor(period) + round(k * frac(period))
+        the remainder product uses Python ints when it exceeds int64
+        (large denominators of float tempos, ex. Fraction(str(60 / 0.47))) '''
+
+    k = np.asarray(k, dtype=np.int64)
+    pInt, pRem = divmod(period.numerator, period.denominator)
+    pDen = period.denominator
+    kMax = int(np.abs(k).max()) if k.size else 0
+    if clkIntFits(2 * kMax * pRem + pDen, kMax * pInt):
+        # round half up: floor((2*k*rem + den) / (2*den))
+        return k * pInt + (2 * k * pRem + pDen) // (2 * pDen)
+    kObj = k.astype(object)
+    return np.asarray(kObj * pInt + (2 * kObj * pRem + pDen) // (2 * pDen)).astype(np.int64)
+
+
+def clkFloorDiv(s, period):
+    ''' floor(s / period) (int64 array s, Fraction period), exact and
+        overflow-free - the integer inverse of clkRoundMul positions '''
+
+    s = np.asarray(s, dtype=np.int64)
+    pNum, pDen = period.numerator, period.denominator
+    sMax = int(np.abs(s).max()) if s.size else 0
+    if clkIntFits(sMax * pDen, pNum):
+        return (s * pDen) // pNum
+    return np.asarray((s.astype(object) * pDen) // pNum).astype(np.int64)
+
+
+def clkRoundInv(s, period):
+    ''' index of the last clkRoundMul position at or before each sample s:
+        max k with round(k * period) <= s  <=>  k * period < s + 1/2
+        => floor(((2s + 1) * den - 1) / (2 * num)), exact and overflow-free '''
+
+    s = np.asarray(s, dtype=np.int64)
+    pNum, pDen = period.numerator, period.denominator
+    sMax = int(np.abs(s).max()) if s.size else 0
+    if clkIntFits((2 * sMax + 1) * pDen + 1, 2 * pNum):
+        return ((2 * s + 1) * pDen - 1) // (2 * pNum)
+    return np.asarray(((2 * s.astype(object) + 1) * pDen - 1) // (2 * pNum)).astype(np.int64)
+
+
+def clkExactIdx(numSamples, period):
+    ''' drift-free pulse positions for a Fraction period: pulse k is at
+        round(k * period), rounded per event from the exact product so the
+        error never exceeds half a sample however long the sequence runs
+        (pulses rounding up to numSamples are dropped) '''
+
+    numPulses = -((-int(numSamples) * period.denominator) // period.numerator)
+    pulseIdx = clkRoundMul(np.arange(numPulses, dtype=np.int64), period)
+    return pulseIdx[pulseIdx < numSamples]
+
+
+def clkPulseTrain(numSamples, period):
+    ''' returns a (numSamples, 1) array of 1s every ceil(period) samples
+        (starting at sample 0), 0s elsewhere
+        a Fraction period places pulse k at round(k * period) (clkExactIdx)
+        shared kernel of the odmkClocks sequence generators - one strided
+        assignment instead of a per-sample modulus test '''
+
+    xPulse = np.zeros([numSamples, 1])
+    if isinstance(period, Fraction):
+        if period > 0:
+            xPulse[clkExactIdx(numSamples, period)] = 1
+        return xPulse
+    pulseStep = int(np.ceil(period))
+    if pulseStep > 0:
+        xPulse[::pulseStep] = 1
+    return xPulse
+
+
+def clkPulseEvents(numSamples, period):
+    ''' sparse form of clkPulseTrain - returns an odmkClkEvents object
+        holding the sample index of every pulse '''
+
+    if isinstance(period, Fraction):
+        if period > 0:
+            return odmkClkEvents(clkExactIdx(numSamples, period), numSamples)
+        return odmkClkEvents([], numSamples)
+    pulseStep = int(np.ceil(period))
+    if pulseStep > 0:
+        return odmkClkEvents(np.arange(0, numSamples, pulseStep, dtype=np.int64), numSamples)
+    return odmkClkEvents([], numSamples)
+
+
+# // *********************************************************************** //
+# // *---clock data types
+# // *********************************************************************** //
+
+# dense clock representations of the generators' dtype option
+clkDtypes = ('float', 'bool', 'uint8', 'packed')
+
+
+def clkFormat(eventIdx, numSamples, dtype='float'):
+    ''' dense clock of sorted unique event indexes in a compact data type
+        'float' => legacy (numSamples, 1) float64 column of 1s / 0s
+        'bool' / 'uint8' => 1D (numSamples,) array
+        'packed' => 1D np.packbits bit array (ceil(numSamples / 8) bytes,
+                    big bit order) - 64x smaller than 'float' '''
+
+    if dtype == 'float':
+        xClk = np.zeros([numSamples, 1])
+        xClk[eventIdx] = 1
+    elif dtype == 'bool' or dtype == 'uint8':
+        xClk = np.zeros(numSamples, dtype=dtype)
+        xClk[eventIdx] = 1
+    elif dtype == 'packed':
+        # set the bits directly - no per-sample intermediate
+        xClk = np.zeros((numSamples + 7) // 8, dtype=np.uint8)
+        np.add.at(xClk, eventIdx >> 3, (0x80 >> (eventIdx & 7)).astype(np.uint8))
+    else:
+        raise ValueError('clkFormat: dtype must be one of '+', '.join(clkDtypes))
+    return xClk
+
+
+def clkEventIdx(xClk, dtype='None'):
+    ''' sorted int64 event indexes of any clock representation:
+        odmkClkEvents, dense float / bool / uint8 trains of any shape, or a
+        bit-packed uint8 train (dtype='packed' - a packed array can not be
+        told apart from a dense uint8 train, other dtypes are never packed) '''
+
+    if isinstance(xClk, odmkClkEvents):
+        return xClk.eventIdx
+    xClk = np.asarray(xClk)
+    if dtype == 'packed' and xClk.dtype == np.uint8:
+        # unpack only the non-zero bytes
+        clkBytes = np.flatnonzero(xClk)
+        clkBits = np.unpackbits(xClk[clkBytes].reshape(-1, 1), axis=1)
+        byteRow, bitCol = np.nonzero(clkBits)
+        return clkBytes[byteRow] * 8 + bitCol
+    return np.flatnonzero(xClk)
 
 # /////////////////////////////////////////////////////////////////////////////
 # #############################################################################
@@ -62,6 +211,165 @@ def randomIdx(n, k):
 # #############################################################################
 # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
 
+class odmkClkEvents:
+    ''' sparse clock sequence - sorted int64 sample indexes of the events
+        plus the sequence length, 8 bytes per event instead of 8 bytes per
+        sample for the dense (numSamples, 1) float arrays
+        usage: xDownEvt = myOdmkClks.clkDownBeats(events=True)
+        xDownEvt.eventIdx => sorted unique event sample indexes
+        xDownEvt.dense() => (numSamples, 1) array of 1s at events, 0s elsewhere
+        xDownEvt.union(xDivEvt), xDownEvt.offset(n), xDownEvt.subdivide(n)
+    '''
+
+    def __init__(self, eventIdx, numSamples):
+
+        eventIdx = np.unique(np.asarray(eventIdx, dtype=np.int64))
+        self.eventIdx = eventIdx[(eventIdx >= 0) & (eventIdx < numSamples)]
+        self.numSamples = int(numSamples)
+
+    def __len__(self):
+        return len(self.eventIdx)
+
+    def __iter__(self):
+        return iter(self.eventIdx)
+
+    def __eq__(self, other):
+        return (isinstance(other, odmkClkEvents) and self.numSamples == other.numSamples
+                and np.array_equal(self.eventIdx, other.eventIdx))
+
+    def __repr__(self):
+        return 'odmkClkEvents('+str(len(self.eventIdx))+' events, numSamples='+str(self.numSamples)+')'
+
+    def __array__(self, dtype=None, copy=None):
+        return self.dense(dtype if dtype is not None else np.float64)
+
+    @property
+    def nbytes(self):
+        return self.eventIdx.nbytes
+
+    def dense(self, dtype=np.float64):
+        ''' returns the dense (numSamples, 1) form (1s at events, 0s elsewhere) '''
+
+        xDense = np.zeros([self.numSamples, 1], dtype=dtype)
+        xDense[self.eventIdx] = 1
+        return xDense
+
+    def union(self, other):
+        ''' events of self or other - length is the longer of the two '''
+
+        return odmkClkEvents(np.union1d(self.eventIdx, other.eventIdx),
+                             max(self.numSamples, other.numSamples))
+
+    def offset(self, nSamples):
+        ''' shift all events by nSamples (events shifted outside the
+            sequence are dropped) '''
+
+        return odmkClkEvents(self.eventIdx + int(nSamples), self.numSamples)
+
+    def subdivide(self, n):
+        ''' insert n-1 evenly spaced events (rounded to the nearest sample)
+            between successive events - the last interval is repeated after
+            the final event, ex. quarter beats => sixteenths: subdivide(4) '''
+
+        if len(self.eventIdx) < 2 or n < 2:
+            return odmkClkEvents(self.eventIdx, self.numSamples)
+
+        evtSpan = np.diff(self.eventIdx)
+        evtSpan = np.append(evtSpan, evtSpan[-1])
+        evtDiv = np.arange(n, dtype=np.int64)
+        subIdx = self.eventIdx[:, None] + (2 * evtDiv[None, :] * evtSpan[:, None] + n) // (2 * n)
+
+        return odmkClkEvents(subIdx.ravel(), self.numSamples)
+
+
+class odmkTempoMap:
+    ''' piecewise tempo / time signature map
+        usage: myTempoMap = odmkTempoMap(fs, [(8, 120), (4, 120, 4, 140), (16, 140, 3)])
+        fs => audio sample rate
+        segments => list of (nBars, bpm, tsig=4, bpmEnd=bpm) tuples in order,
+                    bpmEnd != bpm ramps the tempo linearly in time across
+                    the segment, after the last segment the map continues
+                    at the final tempo and time signature
+        all conversions are closed form and vectorized (numpy arrays in,
+        arrays out), beat / sample positions are rounded per event
+    '''
+
+    def __init__(self, fs, segments):
+
+        self.fs = fs
+        self.segments = segments
+
+        nSeg = len(segments) + 1
+        self.segBar = np.zeros(nSeg)
+        self.segBeat = np.zeros(nSeg)
+        self.segTime = np.zeros(nSeg)
+        self.segTsig = np.zeros(nSeg)
+        self.segBpm = np.zeros(nSeg)
+        # tempo slope in bpm per second
+        self.segAccel = np.zeros(nSeg)
+
+        for j, seg in enumerate(segments):
+            nBars, bpm = seg[0], seg[1]
+            tsig = seg[2] if len(seg) > 2 else 4
+            bpmEnd = seg[3] if len(seg) > 3 else bpm
+            nBeats = nBars * tsig
+            # tempo linear in time: nBeats = T * (bpm + bpmEnd) / 120
+            segLength = 120.0 * nBeats / (bpm + bpmEnd)
+            self.segTsig[j] = tsig
+            self.segBpm[j] = bpm
+            self.segAccel[j] = (bpmEnd - bpm) / segLength
+            self.segBar[j+1] = self.segBar[j] + nBars
+            self.segBeat[j+1] = self.segBeat[j] + nBeats
+            self.segTime[j+1] = self.segTime[j] + segLength
+
+        # terminal segment - hold the last tempo / time signature
+        lastSeg = segments[-1]
+        self.segTsig[-1] = lastSeg[2] if len(lastSeg) > 2 else 4
+        self.segBpm[-1] = lastSeg[3] if len(lastSeg) > 3 else lastSeg[1]
+
+    def beatToTime(self, beats):
+        ''' time in seconds of (fractional) beat positions '''
+
+        beats = np.asarray(beats, dtype=np.float64)
+        j = np.clip(np.searchsorted(self.segBeat, beats, 'right') - 1, 0, len(self.segBeat) - 1)
+        dBeat = beats - self.segBeat[j]
+        b0 = self.segBpm[j]
+        # root of accel*t^2/2 + b0*t = 60*dBeat (stable for accel = 0)
+        return self.segTime[j] + 120.0 * dBeat / (b0 + np.sqrt(b0 * b0 + 120.0 * self.segAccel[j] * dBeat))
+
+    def timeToBeat(self, t):
+        ''' (fractional) beat position at times t in seconds '''
+
+        t = np.asarray(t, dtype=np.float64)
+        j = np.clip(np.searchsorted(self.segTime, t, 'right') - 1, 0, len(self.segTime) - 1)
+        dt = t - self.segTime[j]
+        return self.segBeat[j] + (self.segBpm[j] * dt + 0.5 * self.segAccel[j] * dt * dt) / 60.0
+
+    def barToBeat(self, bars):
+        ''' beat position of (fractional) bar positions '''
+
+        bars = np.asarray(bars, dtype=np.float64)
+        j = np.clip(np.searchsorted(self.segBar, bars, 'right') - 1, 0, len(self.segBar) - 1)
+        return self.segBeat[j] + (bars - self.segBar[j]) * self.segTsig[j]
+
+    def beatToBar(self, beats):
+        ''' (fractional) bar position of beat positions '''
+
+        beats = np.asarray(beats, dtype=np.float64)
+        j = np.clip(np.searchsorted(self.segBeat, beats, 'right') - 1, 0, len(self.segBeat) - 1)
+        return self.segBar[j] + (beats - self.segBeat[j]) / self.segTsig[j]
+
+    def beatToSample(self, beats):
+        ''' nearest int64 sample index of beat positions '''
+
+        return np.floor(self.beatToTime(beats) * self.fs + 0.5).astype(np.int64)
+
+    def sampleToBeat(self, samples):
+        ''' (fractional) beat position of sample indexes '''
+
+        return self.timeToBeat(np.asarray(samples, dtype=np.float64) / self.fs)
+
+
 class odmkClocks:
     ''' odmk audio/video clocking modules 
         usage: myOdmkClks = odmkClocks(outLength, fs, bpm, framesPerSec, tsig)
@@ -70,17 +378,29 @@ class odmkClocks:
         bpm => bpm
         framesPerSec => video frames per second
         tsig => time signature: currently = number of quarters per bar (defaults to 4/4)
+        tempoMap => optional odmkTempoMap - the clock generators follow the
+                    map (tempo ramps / time signature changes), bpm and
+                    tsig then only set the scalar per-beat attributes
+        exact => drift-free clocks: pulse periods are kept as exact fractions
+                 (samplesPerBeatQ, ...) and every pulse is rounded to the
+                 nearest sample, instead of stepping by the ceil'd period
+                 (default False = legacy output)
         ex: xDownFrames = myOdmkClks.clkDownFrames() ->
-            returns an np.array of 1's at 1st frame of downbeat, 0's elsewhere
+            returns a (totalFrames, 1) np.array of 1's at the frames holding
+            a downbeat, 0's elsewhere
+        ex: clkSync = myOdmkClks.clkSyncIndex() ->
+            int64 sample <=> frame <=> beat index arrays for video sync
     '''
 
-    def __init__(self, xLength, fs, bpm, framesPerSec, tsig=4):
+    def __init__(self, xLength, fs, bpm, framesPerSec, tsig=4, exact=False, tempoMap='None'):
 
         # *---set primary parameters from inputs---*
 
         self.xLength = xLength
+        self.exact = exact
         self.fs = fs
         self.bpm = bpm
+        self.tsig = tsig
         self.framesPerSec = framesPerSec
         print('\nAn odmkClocks object has been instanced with:')
         print('xLength = '+str(self.xLength)+'; fs = '+str(fs)+'; bpm = '+str(bpm)+'; framesPerSec = '+str(framesPerSec))
@@ -104,13 +424,138 @@ class odmkClocks:
         # *---Define Video secondary Parameters---*
 
         # set samplesPerFrame - Num audio samples per video frame
-        self.samplesPerFrame = framesPerSec * fs
+        self.samplesPerFrame = fs / framesPerSec
         # set framesPerBeat - Num video frames per beat
         self.framesPerBeat = self.spb * framesPerSec
 
         # set totalFrames - Total video frames in x
         self.totalFrames = int(np.ceil(xLength * framesPerSec))
 
+        # *---exact (rational) periods---*
+
+        self.samplesPerBeatQ = clkFraction(fs) * 60 / clkFraction(bpm)
+        self.samplesPerBarQ = clkFraction(tsig) * self.samplesPerBeatQ
+        self.framesPerBeatQ = clkFraction(framesPerSec) * 60 / clkFraction(bpm)
+        # frame f starts at sample ceil(f * samplesPerFrameQ) (always exact)
+        self.samplesPerFrameQ = clkFraction(fs) / clkFraction(framesPerSec)
+        self.clkSync = None
+        if exact:
+            self.totalSamples = math.ceil(clkFraction(xLength) * clkFraction(fs))
+            self.totalFrames = math.ceil(clkFraction(xLength) * clkFraction(framesPerSec))
+
+        # *---tempo map sample <=> beat index---*
+
+        self.tempoMap = tempoMap
+        if tempoMap != 'None':
+            # sample index of every beat / bar start in x (sorted int64)
+            totalBeats = float(tempoMap.sampleToBeat(self.totalSamples))
+            self.beatSample = tempoMap.beatToSample(np.arange(int(np.ceil(totalBeats))))
+            totalBars = float(tempoMap.beatToBar(totalBeats))
+            self.barSample = tempoMap.beatToSample(tempoMap.barToBeat(np.arange(int(np.ceil(totalBars)))))
+            self.beatSample = self.beatSample[self.beatSample < self.totalSamples]
+            self.barSample = self.barSample[self.barSample < self.totalSamples]
+            self.totalBeats = totalBeats
+
+    def clkPeriod(self, period, periodQ):
+        ''' selects the legacy float or the exact Fraction pulse period '''
+
+        if self.exact:
+            return periodQ
+        return period
+
+    def clkEventsOut(self, eventIdx, numSamples, events, dtype='float'):
+        ''' returns event indexes in the requested form (sparse or dense) '''
+
+        clkEvents = odmkClkEvents(eventIdx, numSamples)
+        if events:
+            return clkEvents
+        return clkFormat(clkEvents.eventIdx, numSamples, dtype)
+
+    # // *-----------------------------------------------------------------* //
+    # // *---audio / video sync index
+    # // *-----------------------------------------------------------------* //
+
+    def sampleToFrame(self, sampleIdx):
+        ''' video frame (int64) containing each sample index - O(1) integer
+            arithmetic on the exact samplesPerFrameQ ratio '''
+
+        sampleIdx = np.asarray(sampleIdx, dtype=np.int64)
+        return (sampleIdx * self.samplesPerFrameQ.denominator) // self.samplesPerFrameQ.numerator
+
+    def frameToSample(self, frameIdx):
+        ''' first sample index (int64) of each video frame '''
+
+        frameIdx = np.asarray(frameIdx, dtype=np.int64)
+        return -((-frameIdx * self.samplesPerFrameQ.numerator) // self.samplesPerFrameQ.denominator)
+
+    def clkSyncIndex(self):
+        ''' precomputed (cached) audio / video / beat index arrays (int64):
+            frameSample => first sample of each of the totalFrames frames
+            beatSample => sample of each beat (clkDownBeats events)
+            barSample => sample of each bar start
+            beatFrame => frame holding each beat ("which frames carry a beat")
+            barFrame => frame holding each bar start
+            frameBeat => beat number current at the start of each frame
+                         (-1 before the first beat)
+            each direction is a direct array lookup, nothing per-sample is
+            materialized '''
+
+        if self.clkSync is None:
+            beatSample = self.clkDownBeats(events=True).eventIdx
+            if self.tempoMap != 'None':
+                barSample = self.barSample
+            else:
+                barSample = beatSample[::int(self.tsig)]
+            frameSample = self.frameToSample(np.arange(self.totalFrames))
+
+            self.clkSync = {'frameSample': frameSample,
+                            'beatSample': beatSample,
+                            'barSample': barSample,
+                            'beatFrame': self.sampleToFrame(beatSample),
+                            'barFrame': self.sampleToFrame(barSample),
+                            'frameBeat': np.searchsorted(beatSample, frameSample, 'right') - 1}
+
+        return self.clkSync
+
+    def clkBeatAt(self, sampleIdx):
+        ''' beat number (int64) containing each sample index - the inverse
+            of the clock's own clkDownBeats events (tempoMap clocks use the
+            precomputed beatSample index, exact clocks the integer inverse
+            of the rounded beat positions, legacy clocks ceil(period) steps) '''
+
+        if self.tempoMap != 'None':
+            return np.searchsorted(self.beatSample, sampleIdx, 'right') - 1
+        sampleIdx = np.asarray(sampleIdx, dtype=np.int64)
+        if self.exact:
+            return clkRoundInv(sampleIdx, self.samplesPerBeatQ)
+        return sampleIdx // int(np.ceil(self.samplesPerBeat))
+
+    def clkDivNToSample(self, divIdx, n=1):
+        ''' int64 sample of event divIdx of the clkDivNBeat(n) grid (integer
+            arrays, broadcast) - the clock's own clkGrid('divNBeat', n):
+            legacy clocks step by ceil(samplesPerBar / n), exact clocks
+            round each step from the rational product, tempoMap clocks
+            follow the map
+            note: on legacy clocks the steps of different n do not share a
+            bar grid (and differ from the tsig * ceil(samplesPerBeat) bars
+            of clkBarAt / clkSyncIndex), so divIdx is a step index of the
+            n grid, not a bar position '''
+
+        divIdx, n = np.broadcast_arrays(np.asarray(divIdx, dtype=np.int64), np.asarray(n, dtype=np.int64))
+        divSample = np.zeros(divIdx.shape, dtype=np.int64)
+        for nDiv in np.unique(n):
+            divSel = n == nDiv
+            divSample[divSel] = self.clkGrid('divNBeat', int(nDiv))[0](divIdx[divSel])
+        return divSample
+
+    def clkBarAt(self, sampleIdx):
+        ''' bar number (int64) containing each sample index - bars start
+            every tsig beats (the clkSyncIndex barSample grid) '''
+
+        if self.tempoMap != 'None':
+            return np.searchsorted(self.barSample, sampleIdx, 'right') - 1
+        return self.clkBeatAt(sampleIdx) // int(self.tsig)
+
 
     # // ******************************************************************* //
     # // *---sequence generators
@@ -120,45 +565,45 @@ class odmkClocks:
     # // *---gen downbeat sequence
     # // *-----------------------------------------------------------------* //
 
-    def clkDownBeats(self):
-        ''' generates an output array of 1s at downbeat, 0s elsewhere '''
-
-        xClockDown = np.zeros([self.totalSamples, 1])
-        for i in range(self.totalSamples):
-            if i % np.ceil(self.samplesPerBeat) == 0:
-                xClockDown[i] = 1
-            else:
-                xClockDown[i] = 0
+    def clkDownBeats(self, events=False, dtype='float'):
+        ''' generates an output array of 1s at downbeat, 0s elsewhere
+            events => return the sparse odmkClkEvents form
+            dtype => 'float' (legacy), 'bool', 'uint8' or 'packed' (clkFormat) '''
+
+        if self.tempoMap != 'None':
+            return self.clkEventsOut(self.beatSample, self.totalSamples, events, dtype)
+        clkPeriod = self.clkPeriod(self.samplesPerBeat, self.samplesPerBeatQ)
+        if events or dtype != 'float':
+            return self.clkEventsOut(clkPulseEvents(self.totalSamples, clkPeriod).eventIdx, self.totalSamples, events, dtype)
+        xClockDown = clkPulseTrain(self.totalSamples, clkPeriod)
         return xClockDown
 
-    def clkDownFrames(self):
-        ''' generates an output array of 1s at frames corresponding to
-            downbeats, 0s elsewhere '''
+    def clkDownFrames(self, events=False, dtype='float'):
+        ''' generates a per-frame (totalFrames, 1) output array of 1s at the
+            video frames holding a downbeat, 0s elsewhere
+            events => return the sparse odmkClkEvents form (frame indexes)
+            dtype => 'float' (legacy), 'bool', 'uint8' or 'packed' (clkFormat) '''
 
-        xFramesDown = np.zeros([self.totalSamples, 1])
-        for i in range(self.totalSamples):
-            if i % np.ceil(self.framesPerBeat) == 0:
-                xFramesDown[i] = 1
-            else:
-                xFramesDown[i] = 0
+        xFramesDown = self.clkEventsOut(self.clkSyncIndex()['beatFrame'], self.totalFrames, events, dtype)
         return xFramesDown
 
     # // *-----------------------------------------------------------------* //
     # // *---gen note sequence (xLength samples)
     # // *-----------------------------------------------------------------* //
 
-    def clkQtrBeat(self):
-        ''' Output a 1 at Qtr downbeat for xLength samples '''
+    def clkQtrBeat(self, events=False, dtype='float'):
+        ''' Output a 1 at Qtr downbeat for xLength samples
+            events => return the sparse odmkClkEvents form
+            dtype => 'float' (legacy), 'bool', 'uint8' or 'packed' (clkFormat) '''
 
         # set samplesPerBeat
-        samplesPerQtr = self.samplesPerBeat    # assume 1Qtr = 1Beat
+        samplesPerQtr = self.clkPeriod(self.samplesPerBeat, self.samplesPerBeatQ)    # assume 1Qtr = 1Beat
 
-        xQtrBeat = np.zeros([self.totalSamples, 1])
-        for i in range(self.totalSamples):
-            if i % np.ceil(samplesPerQtr) == 0:
-                xQtrBeat[i] = 1
-            else:
-                xQtrBeat[i] = 0
+        if self.tempoMap != 'None':
+            return self.clkEventsOut(self.beatSample, self.totalSamples, events, dtype)
+        if events or dtype != 'float':
+            return self.clkEventsOut(clkPulseEvents(self.totalSamples, samplesPerQtr).eventIdx, self.totalSamples, events, dtype)
+        xQtrBeat = clkPulseTrain(self.totalSamples, samplesPerQtr)
         return xQtrBeat
         
 
@@ -166,17 +611,25 @@ class odmkClocks:
     # // *---gen note sequence (nBar # of bars)
     # // *-----------------------------------------------------------------* //
 
-    def clkQtrBeatBar(self, nBar=1):
+    def clkQtrBeatBar(self, nBar=1, events=False, dtype='float'):
         ''' Output a 1 at Qtr downbeat for 'nBar' bars (4/4, 4 qtr notes)
-            optional nBar parameter: default nBar = 1 bar '''
-
-        numSamples = int(np.ceil(nBar * self.samplesPerBar))
-        xQtrBar = np.zeros([numSamples, 1])
-        for i in range(numSamples):
-            if i % np.ceil(self.samplesPerBeat) == 0:
-                xQtrBar[i] = 1
-            else:
-                xQtrBar[i] = 0
+            optional nBar parameter: default nBar = 1 bar
+            events => return the sparse odmkClkEvents form
+            dtype => 'float' (legacy), 'bool', 'uint8' or 'packed' (clkFormat) '''
+
+        if self.tempoMap != 'None':
+            barBeats = float(self.tempoMap.barToBeat(nBar))
+            numSamples = int(np.ceil(self.tempoMap.beatToTime(barBeats) * self.fs))
+            barBeatIdx = self.tempoMap.beatToSample(np.arange(int(np.floor(barBeats)) + 1))
+            return self.clkEventsOut(barBeatIdx, numSamples, events, dtype)
+        if self.exact:
+            numSamples = math.ceil(clkFraction(nBar) * self.samplesPerBarQ)
+        else:
+            numSamples = int(np.ceil(nBar * self.samplesPerBar))
+        clkPeriod = self.clkPeriod(self.samplesPerBeat, self.samplesPerBeatQ)
+        if events or dtype != 'float':
+            return self.clkEventsOut(clkPulseEvents(numSamples, clkPeriod).eventIdx, numSamples, events, dtype)
+        xQtrBar = clkPulseTrain(numSamples, clkPeriod)
         return xQtrBar
 
 
@@ -201,21 +654,83 @@ class odmkClocks:
 #        return xDiv3Beat
 
 
-    def clkDivNBeat(self, n):
-        ''' Output a pulse every bar/n samples for xLength samples '''
+    def clkDivNBeat(self, n, events=False, dtype='float'):
+        ''' Output a pulse every bar/n samples for xLength samples
+            events => return the sparse odmkClkEvents form
+            dtype => 'float' (legacy), 'bool', 'uint8' or 'packed' (clkFormat) '''
 
         # set samplesPerBeat
         # samplesPerBar = self.samplesPerBar    # assume 1Qtr = 1Beat
-        clkDivN = np.ceil(self.samplesPerBar / n)
-
-        clkDivNBeat = np.zeros([self.totalSamples, 1])
-        for i in range(self.totalSamples):
-            if i % clkDivN == 0:
-                clkDivNBeat[i] = 1
-            else:
-                clkDivNBeat[i] = 0
+        if self.tempoMap != 'None':
+            # bar j + k/n for every bar - one vectorized pass over the map
+            barDiv = np.arange(len(self.barSample) * n) / n
+            divIdx = self.tempoMap.beatToSample(self.tempoMap.barToBeat(barDiv))
+            return self.clkEventsOut(divIdx, self.totalSamples, events, dtype)
+        clkDivN = self.clkPeriod(np.ceil(self.samplesPerBar / n), self.samplesPerBarQ / clkFraction(n))
+        if events or dtype != 'float':
+            return self.clkEventsOut(clkPulseEvents(self.totalSamples, clkDivN).eventIdx, self.totalSamples, events, dtype)
+
+        clkDivNBeat = clkPulseTrain(self.totalSamples, clkDivN)
         return clkDivNBeat
 
+
+    # // ******************************************************************* //
+    # // *---streaming block generators
+    # // ******************************************************************* //
+
+    def clkGrid(self, kind, n=1):
+        ''' event grid of a clock sequence as a pair of vectorized functions:
+            gridSample(k) => int64 sample of event k
+            gridAt(s) => index of the last event at or before sample s
+                         (an estimate within +/-1 is enough)
+            kind => 'downBeats', 'qtrBeat' or 'divNBeat' (bar / n) '''
+
+        if kind in ('downBeats', 'qtrBeat'):
+            if self.tempoMap != 'None':
+                return (lambda k: self.tempoMap.beatToSample(k),
+                        lambda s: np.floor(self.tempoMap.sampleToBeat(s)).astype(np.int64))
+            clkPeriod = self.clkPeriod(self.samplesPerBeat, self.samplesPerBeatQ)
+        elif kind == 'divNBeat':
+            if self.tempoMap != 'None':
+                return (lambda k: self.tempoMap.beatToSample(self.tempoMap.barToBeat(k / n)),
+                        lambda s: np.floor(self.tempoMap.beatToBar(self.tempoMap.sampleToBeat(s)) * n).astype(np.int64))
+            clkPeriod = self.clkPeriod(np.ceil(self.samplesPerBar / n), self.samplesPerBarQ / clkFraction(n))
+        else:
+            raise ValueError('odmkClocks.clkGrid: unknown clock kind '+str(kind))
+
+        if isinstance(clkPeriod, Fraction):
+            return (lambda k: clkRoundMul(k, clkPeriod),
+                    lambda s: clkFloorDiv(s, clkPeriod))
+        pulseStep = int(np.ceil(clkPeriod))
+        return (lambda k: k * pulseStep,
+                lambda s: s // pulseStep)
+
+    def clkBlocks(self, kind, blockSize, n=1, events=False, numSamples='None', dtype='float'):
+        ''' generator - clock sequence in blocks of samples [k*B, (k+1)*B)
+            kind => 'downBeats', 'qtrBeat' or 'divNBeat' (n pulses per bar)
+            blockSize => samples per block (the final block may be shorter)
+            events => yield odmkClkEvents with block-relative indexes
+                      instead of dense (blockSize, 1) float arrays
+            dtype => dense block data type (clkFormat), 'packed' blocks
+                     are byte aligned when blockSize is a multiple of 8
+            numSamples => total samples (default totalSamples) - may be
+                          longer than xLength, memory is O(blockSize)
+            events of each block are computed directly from the grid, so
+            the blocks match the full-length generator exactly
+            usage:
+            >>for xBeatBlk in myOdmkClks.clkBlocks('downBeats', 4096):
+            >>    wavWriter.write(oscBlk * xBeatBlk.T) '''
+
+        if numSamples == 'None':
+            numSamples = self.totalSamples
+        gridSample, gridAt = self.clkGrid(kind, n)
+
+        for blkStart in range(0, numSamples, blockSize):
+            blkLength = min(blockSize, numSamples - blkStart)
+            gridK = np.arange(max(int(gridAt(blkStart)) - 1, 0), int(gridAt(blkStart + blkLength)) + 2)
+            blkIdx = np.asarray(gridSample(gridK), dtype=np.int64) - blkStart
+            yield self.clkEventsOut(blkIdx, blkLength, events, dtype)
+
 # /////////////////////////////////////////////////////////////////////////////
 # #############################################################################
 # end : object definition
@@ -27,6 +27,7 @@ import matplotlib.pyplot as plt
 from odmkClear import *
 
 import odmkClocks as clks
+import odmkMathUtil as mathutil
 import odmkSigGen1 as sigGen
 
 # temp python debugger - use >>>pdb.set_trace() to set break
@@ -52,20 +53,6 @@ print('// \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\ //')
 # #############################################################################
 # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
 
-# // *---------------------------------------------------------------------* //
-# // *--Math Functions--*
-# // *---------------------------------------------------------------------* //
-
-def cyclicZn(n):
-    ''' calculates the Zn roots of unity '''
-    cZn = np.zeros((n, 1))*(0+0j)    # column vector of zero complex values
-    for k in range(n):
-        # z(k) = e^(((k)*2*pi*1j)/n)        # Define cyclic group Zn points
-        cZn[k] = np.cos(((k)*2*np.pi)/n) + np.sin(((k)*2*np.pi)/n)*1j   # Euler's identity
-
-    return cZn
-    
-    
 # // *---------------------------------------------------------------------* //
 # // *--Plot Functions--*
 # // *---------------------------------------------------------------------* //    
@@ -266,7 +253,7 @@ print('generated array of orthogonal sin signals "orthoSinArray"')
 # ex. for cyclicZn(15), we want to use czn[1, 2, 3, ... 7]
 
 numOrthoFreq = 7
-czn = cyclicZn(2*numOrthoFreq + 1)
+czn = mathutil.cyclicZn(2*numOrthoFreq + 1)
 
 orthoFreqArray = np.array([])
 for c in range(1, numOrthoFreq+1):
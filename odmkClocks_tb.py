@@ -39,6 +39,7 @@ import odmkPlotUtil as odmkplt
 #sys.path.insert(1, 'C:/odmkDev/odmkCode/odmkPython/DSP')
 sys.path.insert(2, rootDir+'DSP')
 import odmkClocks as clks
+import odmkMathUtil as mathutil
 import odmkSigGen1 as sigGen
 
 # temp python debugger - use >>>pdb.set_trace() to set break
@@ -65,20 +66,6 @@ print('// \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\ //')
 # #############################################################################
 # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
 
-# // *---------------------------------------------------------------------* //
-# // *--Math Functions--*
-# // *---------------------------------------------------------------------* //
-
-def cyclicZn(n):
-    ''' calculates the Zn roots of unity '''
-    cZn = np.zeros((n, 1))*(0+0j)    # column vector of zero complex values
-    for k in range(n):
-        # z(k) = e^(((k)*2*pi*1j)/n)        # Define cyclic group Zn points
-        cZn[k] = np.cos(((k)*2*np.pi)/n) + np.sin(((k)*2*np.pi)/n)*1j   # Euler's identity
-
-    return cZn
-    
-    
 # // *---------------------------------------------------------------------* //
 # // *--Plot Functions--*
 # // *---------------------------------------------------------------------* //    
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header begin-----------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+# __::((odmkMathUtil.py))::__
+
+# shared math utilities - random index sampling and roots of unity
+#
+# random functions take a seed / np.random.Generator so every stream is
+# reproducible, rngStreams spawns independent substreams for parallel
+# workers (np.random.SeedSequence)
+#
+# usage:
+# >>czn = odmkMathUtil.cyclicZn(15)
+# >>workerRng = odmkMathUtil.rngStreams(1234, nWorkers)
+# >>randIdx = odmkMathUtil.randomIdx(64, len(wavBank), workerRng[0])
+#
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header end-------------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+import numpy as np
+
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# begin : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+# // *---------------------------------------------------------------------* //
+# // *---random streams
+# // *---------------------------------------------------------------------* //
+
+def rngGen(seed='None'):
+    ''' returns a np.random.Generator
+        seed => 'None' (fresh OS entropy), an int / SeedSequence, or an
+                existing Generator (returned as is) '''
+
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(None if seed == 'None' else seed)
+
+
+def rngStreams(seed, nStreams):
+    ''' returns nStreams statistically independent Generators spawned from
+        one seed - one per parallel worker, reproducible for a given seed '''
+
+    return [np.random.Generator(np.random.PCG64(s)) for s in np.random.SeedSequence(seed).spawn(nStreams)]
+
+
+def randomIdx(n, k, rng='None'):
+    ''' returns an int64 array of n random indexes uniformly drawn from
+        0:k-1 (all k indexes equally likely)
+        rng => seed or np.random.Generator (see rngGen) '''
+
+    return rngGen(rng).integers(0, k, size=n, dtype=np.int64)
+
+
+# // *---------------------------------------------------------------------* //
+# // *---roots of unity
+# // *---------------------------------------------------------------------* //
+
+# n => read-only (n,) complex roots of unity
+znCache = {}
+
+
+def rootsOfUnity(n):
+    ''' returns the cached read-only (n,) array of the Zn roots of unity
+        z(k) = e^((k*2*pi*1j)/n) '''
+
+    if n not in znCache:
+        znPh = (np.arange(n) * 2 * np.pi) / n
+        zn = np.cos(znPh) + np.sin(znPh) * 1j    # Euler's identity
+        zn.flags.writeable = False
+        znCache[n] = zn
+
+    return znCache[n]
+
+
+def cyclicZn(n):
+    ''' calculates the Zn roots of unity - (n, 1) column view of the
+        cached rootsOfUnity table (read-only, copy before modifying) '''
+
+    return rootsOfUnity(n).reshape(n, 1)
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
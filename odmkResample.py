@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header begin-----------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+# __::((odmkResample.py))::__
+
+# polyphase sample-rate conversion (fsOut / fsIn = L / M)
+#
+# a kaiser windowed-sinc prototype is designed at L * fsIn and split into
+# L phases of K taps, each output sample is one K tap dot product
+# filter banks are cached per (fsIn, fsOut) ratio
+#
+# usage:
+# >>x48K = odmkResample.resample(x44K, 44100, 48000)
+# >>wavSRC = odmkResample.odmkResampler(44100, 48000)
+# >>for wavBlock in wavBlocks:
+# >>    wavOut = wavSRC.process(wavBlock)
+# >>wavOut = wavSRC.flush()
+#
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header end-------------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+from fractions import Fraction
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# begin : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+# (L, M, halfLen, rolloff, beta) => (hPolyRev, delay)
+polyBankCache = {}
+
+
+def polyRatio(fsIn, fsOut):
+    ''' returns the reduced up / down factors (L, M) of fsOut / fsIn '''
+
+    fsRatio = Fraction(int(round(fsOut)), int(round(fsIn)))
+    return fsRatio.numerator, fsRatio.denominator
+
+
+def polyBank(fsIn, fsOut, halfLen=32, rolloff=0.95, beta=8.6):
+    ''' returns the cached polyphase filter bank for fsIn => fsOut
+        halfLen => zero crossings of the sinc on each side of the center
+        rolloff => cutoff as a fraction of the lower Nyquist frequency
+        beta => kaiser window beta (8.6 ~ 90dB stopband)
+        returns (L, M, hPolyRev, delay):
+        hPolyRev => (L, K) array, row p = phase p taps in time-reversed order
+        delay => filter delay in output samples (an exact integer) '''
+
+    upL, downM = polyRatio(fsIn, fsOut)
+    bankKey = (upL, downM, halfLen, rolloff, beta)
+
+    if bankKey not in polyBankCache:
+        # cutoff in cycles per upsampled sample
+        fCut = rolloff * 0.5 / max(upL, downM)
+        hLen = int(np.ceil(halfLen / (2 * fCut)))
+
+        # center the prototype on an output sample: delay = center / M
+        polyDelay = int(np.ceil(hLen / downM))
+        hCenter = polyDelay * downM
+        K = int(np.ceil((hCenter + hLen + 1) / upL))
+
+        hProto = np.zeros(K * upL)
+        hIdx = np.arange(hCenter - hLen, hCenter + hLen + 1)
+        hProto[hIdx] = (2 * fCut * upL) * np.sinc(2 * fCut * (hIdx - hCenter)) * np.kaiser(2 * hLen + 1, beta)
+
+        # phase p holds taps p, p+L, p+2L, ... - reversed for window dot products
+        hPolyRev = np.ascontiguousarray(hProto.reshape(K, upL).T[:, ::-1])
+        polyBankCache[bankKey] = (hPolyRev, polyDelay)
+
+    hPolyRev, polyDelay = polyBankCache[bankKey]
+
+    return upL, downM, hPolyRev, polyDelay
+
+
+def resample(wavIn, fsIn, fsOut, blockSize=65536):
+    ''' resample a (channels, frames) or 1D array from fsIn to fsOut
+        the output has ceil(frames * fsOut / fsIn) frames and is time
+        aligned with the input (filter delay removed)
+        memory is bounded by processing blockSize input frames at a time '''
+
+    wavIn = np.asarray(wavIn, dtype=np.float64)
+    upL, downM = polyRatio(fsIn, fsOut)
+    if upL == downM:
+        return wavIn.copy()
+
+    wavSRC = odmkResampler(fsIn, fsOut)
+    # at least one (possibly empty) block so flush knows the channel count
+    wavOut = [wavSRC.process(wavIn[..., i:i+blockSize]) for i in range(0, max(wavIn.shape[-1], 1), blockSize)]
+    wavOut.append(wavSRC.flush())
+
+    return np.concatenate(wavOut, axis=-1)
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# begin : object definition
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+class odmkResampler:
+    ''' streaming polyphase resampler - filter state is carried between blocks
+        usage: wavSRC = odmkResampler(fsIn, fsOut)
+        wavSRC.process(wavBlock) => resampled (channels, n) or 1D block,
+                                    block sizes may vary from call to call
+        wavSRC.flush() => remaining output at the end of the stream
+        wavSRC.stream(wavBlocks) => generator wrapping process / flush
+    '''
+
+    def __init__(self, fsIn, fsOut, halfLen=32, rolloff=0.95, beta=8.6):
+
+        self.fsIn = fsIn
+        self.fsOut = fsOut
+        self.upL, self.downM, self.hPolyRev, self.delay = polyBank(fsIn, fsOut, halfLen, rolloff, beta)
+        self.K = self.hPolyRev.shape[1]
+
+        # last K-1 input frames of the previous block
+        self.xHist = None
+        self.monoIn = False
+        # input frames consumed / output frames computed (incl. delay)
+        self.nIn = 0
+        self.nOut = 0
+        self.nDropped = 0
+
+    def process(self, wavBlock):
+        ''' resample the next block of the stream '''
+
+        wavBlock = np.asarray(wavBlock, dtype=np.float64)
+        if self.xHist is None:
+            self.monoIn = wavBlock.ndim == 1
+        if wavBlock.ndim == 1:
+            wavBlock = wavBlock.reshape(1, len(wavBlock))
+        if self.xHist is None:
+            self.xHist = np.zeros((wavBlock.shape[0], self.K - 1))
+
+        upL, downM, K = self.upL, self.downM, self.K
+
+        xBuf = np.concatenate((self.xHist, wavBlock), axis=1)
+        bufStart = self.nIn - (K - 1)
+        self.nIn += wavBlock.shape[1]
+
+        # output n needs input floor(n*M/L) - compute every n < nIn*L/M
+        nMax = (self.nIn * upL + downM - 1) // downM
+        nNew = nMax - self.nOut
+        wavOut = np.empty((wavBlock.shape[0], max(nNew, 0)))
+
+        # outputs n0, n0+L, n0+2L, ... share a phase and read input windows
+        # M frames apart - one strided window view x phase taps per residue
+        if nNew > 0:
+            xWin = sliding_window_view(xBuf, K, axis=1)
+        for r in range(min(upL, max(nNew, 0))):
+            n0 = self.nOut + r
+            nCnt = (nMax - 1 - n0) // upL + 1
+            winStart = (n0 * downM) // upL - (K - 1) - bufStart
+            wavOut[:, r::upL] = xWin[:, winStart:winStart + (nCnt - 1) * downM + 1:downM] @ self.hPolyRev[(n0 * downM) % upL]
+
+        self.nOut = max(nMax, self.nOut)
+        self.xHist = xBuf[:, xBuf.shape[1] - (K - 1):].copy()
+
+        # remove the filter delay at the start of the stream
+        if self.nDropped < self.delay:
+            nDrop = min(self.delay - self.nDropped, wavOut.shape[1])
+            wavOut = wavOut[:, nDrop:]
+            self.nDropped += nDrop
+
+        if self.monoIn:
+            return wavOut[0]
+        return wavOut
+
+    def flush(self):
+        ''' feed zeros through the filter so the stream has a total of
+            ceil(nIn * fsOut / fsIn) output frames
+            (an empty 1D array if process was never called) '''
+
+        if self.xHist is None:
+            return np.zeros(0)
+
+        nTarget = self.delay + (self.nIn * self.upL + self.downM - 1) // self.downM
+        nInNeed = (nTarget * self.downM + self.upL - 1) // self.upL
+        # frames still owed - process has already returned nOut minus the
+        # dropped filter delay
+        nOutLeft = (nTarget - self.delay) - max(self.nOut - self.delay, 0)
+
+        wavOut = self.process(np.zeros((self.xHist.shape[0], max(nInNeed - self.nIn, 0))))
+        return wavOut[..., 0:max(nOutLeft, 0)]
+
+    def stream(self, wavBlocks):
+        ''' generator - resample an iterable of blocks, flushing at the end '''
+
+        for wavBlock in wavBlocks:
+            yield self.process(wavBlock)
+        yield self.flush()
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : object definition
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header begin-----------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+# __::((odmkSequencer.py))::__
+
+# clock triggered sample sequencer
+#
+# renders a bank of sample buffers (ex. odmkWavIO.wavRead outputs) at the
+# trigger positions of odmkClocks / odmkClkPatterns events, all triggers of
+# one buffer are mixed by a single vectorized overlap-add (np.bincount)
+#
+# usage:
+# >>patIdx, smplIdx = odmkClkPatterns.clkPatterns(myOdmkClks, k=[4, 3, 7], n=[16, 8, 16])
+# >>wavMix = odmkSequencer.seqRender([kick, snare, hat], patIdx, smplIdx,
+# >>                                 myOdmkClks.totalSamples, voiceCap=2)
+# >>bankIdx, trigIdx = odmkSequencer.seqTriggers([myOdmkClks.clkDownBeats(dtype='bool'), xSnare])
+#
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header end-------------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+import numpy as np
+
+import odmkClocks as clks
+
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# begin : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+def seqTriggers(trackTrigs, clkDtype='None'):
+    ''' convert a list of per buffer trigger clocks (one entry per wavBank
+        buffer) to the flat (bankIdx, trigIdx) form used by seqRender
+        any odmkClocks output is accepted - odmkClkEvents or dense float /
+        bool / uint8 trains, bit-packed trains with clkDtype='packed' '''
+
+    trigIdx = [clks.clkEventIdx(trig, clkDtype) for trig in trackTrigs]
+    bankIdx = [np.full(len(trig), j, dtype=np.int64) for j, trig in enumerate(trigIdx)]
+    if not trigIdx:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    return np.concatenate(bankIdx), np.concatenate(trigIdx)
+
+
+def seqVoiceLength(trigIdx, smplLength, voiceCap='None'):
+    ''' sounding length of each trigger of one buffer (trigIdx sorted)
+        voiceCap => max overlapping voices (>= 1) - voice j is cut when
+                    trigger j+voiceCap starts (oldest voice stolen first) '''
+
+    if voiceCap != 'None' and voiceCap < 1:
+        raise ValueError('seqVoiceLength: voiceCap must be at least 1 (got '+str(voiceCap)+')')
+    voiceLength = np.full(len(trigIdx), smplLength, dtype=np.int64)
+    if voiceCap != 'None' and len(trigIdx) > voiceCap:
+        voiceLength[:-voiceCap] = np.minimum(voiceLength[:-voiceCap], trigIdx[voiceCap:] - trigIdx[:-voiceCap])
+    return voiceLength
+
+
+def seqOverlapAdd(wavMix, wavSmpl, trigIdx, trigGain, voiceLength):
+    ''' mix every trigger of one buffer into wavMix in place
+        wavMix => (nChan, numSamples) output, wavSmpl => (nChan or 1, L)
+        overlap-add of all voices as one flat scatter per channel:
+        output index t[j] + n, n < voiceLength[j], weight gain[j] * x[n] '''
+
+    numSamples = wavMix.shape[1]
+    voiceLength = np.minimum(voiceLength, numSamples - trigIdx)
+    voiceOn = voiceLength > 0
+    trigIdx, trigGain, voiceLength = trigIdx[voiceOn], trigGain[voiceOn], voiceLength[voiceOn]
+    if len(trigIdx) == 0:
+        return
+
+    voiceStart = np.cumsum(voiceLength) - voiceLength
+    voiceOwner = np.repeat(np.arange(len(trigIdx)), voiceLength)
+    smplPos = np.arange(len(voiceOwner)) - voiceStart[voiceOwner]
+
+    mixLo = int(trigIdx[0])
+    mixHi = int((trigIdx + voiceLength).max())
+    mixIdx = trigIdx[voiceOwner] - mixLo + smplPos
+    mixGain = trigGain[voiceOwner]
+
+    for c in range(wavMix.shape[0]):
+        smplCh = wavSmpl[c if wavSmpl.shape[0] > 1 else 0]
+        wavMix[c, mixLo:mixHi] += np.bincount(mixIdx, weights=mixGain * smplCh[smplPos], minlength=mixHi - mixLo)
+
+
+def seqRender(wavBank, bankIdx, trigIdx, numSamples='None', gain=1.0, voiceCap='None', chunkSize=2**22):
+    ''' render the triggered mix of a bank of sample buffers
+        wavBank => list of buffers, (channels, L) or 1D (mono), mono
+                   buffers are played on every output channel
+        bankIdx, trigIdx => buffer and start sample of every trigger, ex.
+                            the (patternIdx, sampleIdx) of clkPatterns or
+                            seqTriggers([xKickEvt, xSnareEvt])
+        numSamples => output length (default = end of the last voice)
+        gain => scalar or per trigger gain
+        voiceCap => max overlapping voices per buffer, >= 1 (default unlimited)
+        chunkSize => max voice samples scattered at once (bounds memory)
+        returns a (channels, numSamples) float64 mix '''
+
+    wavBank = [np.atleast_2d(np.asarray(wavSmpl, dtype=np.float64)) for wavSmpl in wavBank]
+    bankIdx = np.asarray(bankIdx, dtype=np.int64)
+    trigIdx = np.asarray(trigIdx, dtype=np.int64)
+    trigGain = np.broadcast_to(np.asarray(gain, dtype=np.float64), trigIdx.shape)
+
+    nChan = max([wavSmpl.shape[0] for wavSmpl in wavBank] + [1])
+    for wavSmpl in wavBank:
+        if wavSmpl.shape[0] not in (1, nChan):
+            raise ValueError('seqRender: buffers must be mono or have '+str(nChan)+' channels')
+
+    if numSamples == 'None':
+        smplLength = np.array([wavSmpl.shape[1] for wavSmpl in wavBank], dtype=np.int64)
+        numSamples = int((trigIdx + smplLength[bankIdx]).max()) if len(trigIdx) else 0
+
+    wavMix = np.zeros((nChan, numSamples))
+
+    for j, wavSmpl in enumerate(wavBank):
+        trigSel = np.nonzero((bankIdx == j) & (trigIdx >= 0) & (trigIdx < numSamples))[0]
+        trigSel = trigSel[np.argsort(trigIdx[trigSel], kind='stable')]
+        bankTrig, bankGain = trigIdx[trigSel], trigGain[trigSel]
+        voiceLength = seqVoiceLength(bankTrig, wavSmpl.shape[1], voiceCap)
+
+        # chunk the triggers so each scatter holds ~chunkSize voice samples
+        chunkEnd = np.searchsorted(np.cumsum(voiceLength), np.arange(chunkSize, voiceLength.sum() + chunkSize, chunkSize), 'right')
+        chunkLo = 0
+        for chunkHi in chunkEnd:
+            chunkHi = max(int(chunkHi), chunkLo + 1)
+            seqOverlapAdd(wavMix, wavSmpl, bankTrig[chunkLo:chunkHi], bankGain[chunkLo:chunkHi], voiceLength[chunkLo:chunkHi])
+            chunkLo = chunkHi
+            if chunkLo >= len(bankTrig):
+                break
+
+    return wavMix
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
@@ -43,6 +43,7 @@ import native_wav as wavio
 #sys.path.insert(1, 'C:/odmkDev/odmkCode/odmkPython/DSP')
 sys.path.insert(2, rootDir+'DSP')
 import odmkClocks as clks
+import odmkMathUtil as mathutil
 import odmkSigGen1 as sigGen
 
 # temp python debugger - use >>>pdb.set_trace() to set break
@@ -70,19 +71,6 @@ print('// \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\ //')
 # #############################################################################
 # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
 
-# // *---------------------------------------------------------------------* //
-# // *--Math Functions--*
-# // *---------------------------------------------------------------------* //
-
-def cyclicZn(n):
-    ''' calculates the Zn roots of unity '''
-    cZn = np.zeros((n, 1))*(0+0j)    # column vector of zero complex values
-    for k in range(n):
-        # z(k) = e^(((k)*2*pi*1j)/n)        # Define cyclic group Zn points
-        cZn[k] = np.cos(((k)*2*np.pi)/n) + np.sin(((k)*2*np.pi)/n)*1j   # Euler's identity
-
-    return cZn
-    
 
 # /////////////////////////////////////////////////////////////////////////////
 # #############################################################################
@@ -192,7 +180,7 @@ odmkTestFreqArray5_3 = [3200.0, 6400.0, 9600.0, 12800.0, 16000.0, 19200.0,  2240
 multiSinV1 = tbSigGen.multiSin(odmkTestFreqArray5_2)
 
 numOrtFreqs = 7
-nCzn = cyclicZn(2*numOrtFreqs + 1)
+nCzn = mathutil.cyclicZn(2*numOrtFreqs + 1)
 
 nOrthogonalArray = np.array([])
 for c in range(1, numOrtFreqs+1):
@@ -227,7 +215,7 @@ print('generated array of orthogonal sin signals "orthoSinArray"')
 # ex. for cyclicZn(15), we want to use czn[1, 2, 3, ... 7]
 
 numOrthoFreq = 7
-czn = cyclicZn(2*numOrthoFreq + 1)
+czn = mathutil.cyclicZn(2*numOrthoFreq + 1)
 
 orthoFreqArray = np.array([])
 for c in range(1, numOrthoFreq+1):
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header begin-----------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+# __::((odmkWavBatch.py))::__
+
+# parallel batch .wav conversion / analysis built on odmkWavIO
+#
+# files are fanned out across a process pool with a bounded work queue,
+# a failing file is reported and skipped without stopping the batch
+#
+# usage (command line):
+# >python odmkWavBatch.py audioScrDir audioOutDir --bits 16 --workers 8
+#
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header end-------------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+import os
+import sys
+import time
+import argparse
+import traceback
+import concurrent.futures as cf
+import numpy as np
+
+import odmkWavIO as waveio
+
+rootDir = 'C:/odmkDev/odmkCode/odmkPython/'
+audioScrDir = 'C:/odmkDev/odmkCode/odmkPython/audio/wavsrc/'
+audioOutDir = 'C:/odmkDev/odmkCode/odmkPython/audio/wavout/'
+
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# begin : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+# // *---------------------------------------------------------------------* //
+# // *---file list
+# // *---------------------------------------------------------------------* //
+
+def wavBatchList(wavSrcDir, recursive=True):
+    ''' returns a sorted list of full paths of the .wav files in wavSrcDir '''
+
+    wavFiles = []
+    if recursive:
+        for dirPath, dirNames, fileNames in os.walk(wavSrcDir):
+            for fileNm in fileNames:
+                if fileNm.lower().endswith('.wav'):
+                    wavFiles.append(os.path.join(dirPath, fileNm))
+    else:
+        for fileNm in os.listdir(wavSrcDir):
+            if fileNm.lower().endswith('.wav'):
+                wavFiles.append(os.path.join(wavSrcDir, fileNm))
+    wavFiles.sort()
+
+    return wavFiles
+
+
+# // *---------------------------------------------------------------------* //
+# // *---batch jobs (run in the worker processes)
+# // *---------------------------------------------------------------------* //
+
+# one odmkWavIO object per worker process
+wavBatchIO = None
+
+
+def wavBatchWavIO():
+    ''' returns the odmkWavIO object of the current (worker) process '''
+
+    global wavBatchIO
+    if wavBatchIO is None:
+        wavBatchIO = waveio.odmkWavIO()
+    return wavBatchIO
+
+
+def wavBatchOutDir(wavSrcDir, wavOutDir):
+    ''' refuse an output directory that is the source directory (outputs
+        would overwrite the files being read) '''
+
+    if os.path.realpath(wavOutDir) == os.path.realpath(wavSrcDir):
+        raise ValueError('wavBatch: wavOutDir must differ from the source directory '+wavSrcDir)
+
+
+def wavConvertJob(wavInFull, wavSrcDir, wavOutDir, sampleBits=24, formatTag=waveio.WAVE_FORMAT_PCM):
+    ''' convert one file to sampleBits / formatTag into wavOutDir
+        the path relative to wavSrcDir is kept (lib/a/kick.wav =>
+        wavOutDir/a/kick.wav), so equal names in subdirectories never
+        collide
+        returns a dict with the input parameters of the file '''
+
+    wavBatchOutDir(wavSrcDir, wavOutDir)
+    wavIO = wavBatchWavIO()
+    wavInDir, wavIn = os.path.split(wavInFull)
+    wavOutSub = os.path.normpath(os.path.join(wavOutDir, os.path.relpath(wavInDir, wavSrcDir)))
+    wavIn_smpl, wavIn_param = wavIO.wavRead(wavIn, wavInDir+os.sep)
+    wavIO.wavWrite(wavIn_smpl, wavIn, os.path.join(wavOutSub, ''), wavIn_param['fSampleRate'],
+                   sampleBits=sampleBits, formatTag=formatTag)
+
+    return wavIn_param
+
+
+def wavAnalyzeJob(wavInFull, blockSize=65536):
+    ''' per channel peak and rms level of one file (read in blocks)
+        returns the wavRead parameter dict extended with wavPeak / wavRms '''
+
+    wavIO = wavBatchWavIO()
+    wavInDir, wavIn = os.path.split(wavInFull)
+    wavIn_param = waveio.wavHeader(wavInFull)
+
+    wavPeak = np.zeros(wavIn_param['fChannels'])
+    wavSumSq = np.zeros(wavIn_param['fChannels'])
+    for wavBlock in wavIO.wavReadBlocks(wavIn, wavInDir+os.sep, blockSize):
+        wavPeak = np.maximum(wavPeak, np.abs(wavBlock).max(axis=1))
+        wavSumSq += np.einsum('ij,ij->i', wavBlock, wavBlock)
+
+    wavIn_param['wavPeak'] = wavPeak
+    wavIn_param['wavRms'] = np.sqrt(wavSumSq / max(wavIn_param['fNumSamples'], 1))
+
+    return wavIn_param
+
+
+def wavBatchTask(wavJob, wavInFull, jobArgs):
+    ''' run wavJob on one file - any exception is caught and returned so a
+        bad file never takes down the worker or the batch
+        returns (wavInFull, result, error string or None) '''
+
+    try:
+        return wavInFull, wavJob(wavInFull, *jobArgs), None
+    except Exception:
+        return wavInFull, None, traceback.format_exc(limit=2)
+
+
+# // *---------------------------------------------------------------------* //
+# // *---batch engine
+# // *---------------------------------------------------------------------* //
+
+def wavBatch(wavFiles, wavJob=wavAnalyzeJob, jobArgs=(), nWorkers='None', queueDepth='None', verbose=True):
+    ''' fan wavJob(wavInFull, *jobArgs) out over a process pool
+        wavFiles => list of full .wav paths (ex. wavBatchList(audioScrDir))
+        wavJob => module level function (must be picklable)
+        nWorkers => number of worker processes (default = cpu count)
+        queueDepth => max files in flight (default = 4 * nWorkers) - bounds
+                      the memory held by pending results
+        returns a report dict:
+        results => {wavInFull: result} of the files that succeeded
+        errors => {wavInFull: error string} of the files that failed
+        nFiles, nErrors, seconds, filesPerSec, MBPerSec (input bytes) '''
+
+    if nWorkers == 'None':
+        nWorkers = os.cpu_count() or 1
+    if queueDepth == 'None':
+        queueDepth = 4 * nWorkers
+
+    wavResults = {}
+    wavErrors = {}
+    wavBytes = 0
+
+    tStart = time.perf_counter()
+
+    with cf.ProcessPoolExecutor(max_workers=nWorkers) as wavPool:
+        wavPending = set()
+        wavIter = iter(wavFiles)
+        wavQueued = True
+        while wavQueued or wavPending:
+            # top up the work queue
+            while wavQueued and len(wavPending) < queueDepth:
+                wavInFull = next(wavIter, None)
+                if wavInFull is None:
+                    wavQueued = False
+                else:
+                    wavPending.add(wavPool.submit(wavBatchTask, wavJob, wavInFull, jobArgs))
+
+            if not wavPending:
+                break
+            wavDone, wavPending = cf.wait(wavPending, return_when=cf.FIRST_COMPLETED)
+
+            for wavFuture in wavDone:
+                wavInFull, wavResult, wavError = wavFuture.result()
+                if wavError is None:
+                    wavResults[wavInFull] = wavResult
+                    wavBytes += os.path.getsize(wavInFull)
+                else:
+                    wavErrors[wavInFull] = wavError
+                    if verbose:
+                        print('ERROR (wavBatch): '+wavInFull+'\n'+wavError)
+
+    tBatch = time.perf_counter() - tStart
+
+    nFiles = len(wavResults) + len(wavErrors)
+    wavReport = {'results': wavResults, 'errors': wavErrors,
+                 'nFiles': nFiles, 'nErrors': len(wavErrors), 'seconds': tBatch,
+                 'filesPerSec': nFiles / tBatch if tBatch > 0 else 0.0,
+                 'MBPerSec': wavBytes / 2**20 / tBatch if tBatch > 0 else 0.0}
+
+    if verbose:
+        print('\n::((wavBatch processed '+str(nFiles)+' files with '+str(nWorkers)+' workers))::')
+        print('errors = '+str(len(wavErrors)))
+        print('time = %.3f s ; %.1f files/s ; %.1f MB/s' % (tBatch, wavReport['filesPerSec'], wavReport['MBPerSec']))
+
+    return wavReport
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+# // *---------------------------------------------------------------------* //
+
+if __name__ == '__main__':
+
+    wavArgParse = argparse.ArgumentParser(description='odmk parallel .wav batch conversion / analysis')
+    wavArgParse.add_argument('srcDir', help='source directory (searched recursively)')
+    wavArgParse.add_argument('outDir', nargs='?', default='None',
+                             help='output directory - convert files, omit to only analyze')
+    wavArgParse.add_argument('--bits', type=int, default=0, help='output sample bits (default 24, 32 with --float)')
+    wavArgParse.add_argument('--float', action='store_true', help='write IEEE float output')
+    wavArgParse.add_argument('--workers', type=int, default=0, help='worker processes (default cpu count)')
+    wavArgs = wavArgParse.parse_args()
+
+    wavFiles = wavBatchList(wavArgs.srcDir)
+    nWorkers = wavArgs.workers if wavArgs.workers > 0 else 'None'
+
+    if wavArgs.outDir != 'None':
+        formatTag = waveio.WAVE_FORMAT_IEEE_FLOAT if wavArgs.float else waveio.WAVE_FORMAT_PCM
+        if wavArgs.bits > 0:
+            sampleBits = wavArgs.bits
+        else:
+            sampleBits = 32 if wavArgs.float else 24
+        wavOutDir = os.path.join(wavArgs.outDir, '')
+        try:
+            # check the output format once here rather than failing in every worker
+            waveio.wavCodecLookup(formatTag, sampleBits)
+            wavBatchOutDir(wavArgs.srcDir, wavOutDir)
+        except ValueError as wavErr:
+            print('ERROR (odmkWavBatch): '+str(wavErr))
+            sys.exit(2)
+        wavReport = wavBatch(wavFiles, wavConvertJob, (wavArgs.srcDir, wavOutDir, sampleBits, formatTag), nWorkers)
+    else:
+        wavReport = wavBatch(wavFiles, wavAnalyzeJob, (), nWorkers)
+
+    sys.exit(1 if wavReport['nErrors'] else 0)
+
+# // *---------------------------------------------------------------------* //
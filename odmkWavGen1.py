@@ -59,6 +59,260 @@ print('// \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\ //')
 
 # // *---------------------------------------------------------------------* //
 
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# begin : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+def wtShape(shape, depth):
+    ''' create look-up table entries for different waveforms
+        (uncached - use wtTable), closed-form over the table phase t = q / depth
+
+    <<1: sin, 2: cos, 3: tri, 4: saw-up, 5: saw-dn, 6: chebychev,
+      7: pulse1, 8: pulse2, 9: pulse3, 10: pulse4>>
+    '''
+
+    t1 = np.linspace(0.0, 1.0, depth+1)
+    t1 = t1[0:depth]          # crops off the last point for proper cyclic table
+
+    if shape == 1:    # store 1 cycle of sin
+        table1 = np.sin(2 * np.pi * t1)
+
+    elif shape == 2:    # store 1 cycle of cos
+        table1 = np.cos(2 * np.pi * t1)
+
+    elif shape == 3:    # store 1 cycle of tri (0 -> 1 -> -1 -> 0, any depth)
+        table1 = 1 - np.abs(((4 * t1 + 1) % 4) - 2)
+
+    elif shape == 4:    # store 1 cycle of saw-up
+        table1 = np.linspace(-1,1,depth)
+
+    elif shape == 5:    # store 1 cycle of saw-down
+        table1 = np.linspace(1,-1,depth)
+
+    elif shape == 6:    # store 1 cycle of chebychev
+        table1 = np.cos(13 * np.arccos(t1))
+
+    elif shape == 7:    # store 1 cycle of pulse1
+        table1 = np.sin(5 * np.pi * np.linspace(1,0,depth)**3)
+
+    elif shape == 8:    # store 1 cycle of pulse2
+        table1 = np.sin(9 * np.pi * np.linspace(1,0,depth)**3)
+
+    elif shape == 9:    # store 1 cycle of pulse3
+        table1 = np.sin(23 * np.pi * np.linspace(1,0,depth)**3)
+
+    elif shape == 10:    # store 1 cycle of pulse4
+        # create a pseudo-symmetrical exponetial pulse
+        # crops off the last point for proper cyclic table
+        t3_1 = np.linspace(0,1,int(np.floor(depth/2)+1))
+        t3_2 = np.linspace(1,0,int(np.ceil(depth/2)+1))
+        t3 = np.concatenate(( t3_1[0:len(t3_1)-1], t3_2[0:len(t3_2)-1] ))**3
+        table1 = np.cos(5 * np.pi * t3)
+
+    else:    # default
+        table1 = np.sin(2 * np.pi * t1)
+
+    return table1
+
+
+# (shape, depth, band) => read-only table, band 0 is the full table, band k
+# the mip-map level band limited to (depth // 2) >> k harmonics
+wtTableCache = {}
+
+
+def wtTable(shape, depth, band=0):
+    ''' returns the cached read-only wavetable of a shape (see wtShape)
+        band => mip-map level, 0 = full table, k > 0 keeps harmonics up to
+                (depth // 2) >> k (rfft truncation of the full table) '''
+
+    tbKey = (shape, depth, band)
+    if tbKey not in wtTableCache:
+        if band == 0:
+            table1 = np.asarray(wtShape(shape, depth), dtype=np.float64)
+        else:
+            tbSpec = np.fft.rfft(wtTable(shape, depth, 0))
+            tbSpec[((depth // 2) >> band) + 1:] = 0
+            table1 = np.fft.irfft(tbSpec, depth)
+        table1.flags.writeable = False
+        wtTableCache[tbKey] = table1
+
+    return wtTableCache[tbKey]
+
+
+def wtHarmonicTable(harmAmp, harmPhase=0.0, depth=4096, shape='None', normalize=True):
+    ''' user wavetable from a harmonic spectrum (inverse real FFT)
+        harmAmp => amplitude of harmonics 1, 2, ... (len <= depth // 2)
+        harmPhase => phase of each harmonic (radians, 0 = sin), broadcast
+        normalize => scale the table peak to 1
+        shape => optional key - registers the table in wtTableCache so
+                 wtTable(shape, depth) / odmkWTOsc1(numSamples, shape, ...)
+                 play it (mip-map levels are rebuilt from it)
+        usage:
+        >>wtHarmonicTable(1.0 / np.arange(1, 65), shape='saw64')
+        >>organOsc = tbWavGen.odmkWTOsc1(numSamples, 'saw64', 110.0, 0)[0] '''
+
+    harmAmp = np.atleast_1d(np.asarray(harmAmp, dtype=np.float64))
+    if len(harmAmp) > depth // 2:
+        raise ValueError('wtHarmonicTable: at most depth // 2 = '+str(depth // 2)+' harmonics')
+
+    # bin k = (depth / 2) * a * e^(j(phase - pi/2)) => a * sin(2 pi k t + phase)
+    tbSpec = np.zeros(depth // 2 + 1, dtype=np.complex128)
+    tbSpec[1:len(harmAmp)+1] = (depth / 2) * harmAmp * np.exp(1j * (np.asarray(harmPhase, dtype=np.float64) - np.pi / 2))
+    table1 = np.fft.irfft(tbSpec, depth)
+    if normalize == True and np.any(table1):
+        table1 /= np.abs(table1).max()
+
+    if shape != 'None':
+        for tbKey in [tbKey for tbKey in wtTableCache if tbKey[0:2] == (shape, depth)]:
+            del wtTableCache[tbKey]
+        table1.flags.writeable = False
+        wtTableCache[(shape, depth, 0)] = table1
+
+    return table1
+
+
+def wtMipLevels(depth):
+    ''' number of mip-map levels of a table - the last keeps 1 harmonic '''
+
+    return int(np.log2(depth // 2)) + 1
+
+
+def wtMipMap(shape, depth):
+    ''' (levels, depth) stack of the cached mip-map levels of a shape '''
+
+    return np.stack([wtTable(shape, depth, band) for band in range(wtMipLevels(depth))])
+
+
+def wtMipLevel(freqCtrl, depth, fs):
+    ''' mip-map level per frequency - the lowest level whose top harmonic
+        stays below fs / 2: ((depth // 2) >> k) * |f| <= fs / 2 '''
+
+    mipRatio = np.maximum(np.abs(np.asarray(freqCtrl, dtype=np.float64)) * (depth / fs), 1.0)
+    return np.minimum(np.ceil(np.log2(mipRatio)), wtMipLevels(depth) - 1).astype(np.intp)
+
+
+def wtOscPhase(skipInc, accAddr0, tableDepth, blockSize=65536):
+    ''' phase accumulator sequence in table address units (along last axis)
+        accAddr[0] = accAddr0, accAddr[i+1] = (accAddr[i] + skipInc[i]) % depth
+        cumsum per block of blockSize samples, wrapped between blocks so the
+        running sum never loses precision on long renders '''
+
+    skipInc = np.asarray(skipInc, dtype=np.float64)
+    numSamples = skipInc.shape[-1]
+    accAddr = np.empty(skipInc.shape)
+    accCarry = np.asarray(accAddr0, dtype=np.float64)
+    for lo in range(0, numSamples, blockSize):
+        hi = min(lo + blockSize, numSamples)
+        accAddr[..., lo] = accCarry
+        np.cumsum(skipInc[..., lo:hi-1], axis=-1, out=accAddr[..., lo+1:hi])
+        accAddr[..., lo+1:hi] += accCarry[..., None]
+        accCarry = np.mod(accAddr[..., hi-1] + skipInc[..., hi-1], tableDepth)
+        accAddr[..., lo:hi] -= tableDepth * np.floor(accAddr[..., lo:hi] * (1.0 / tableDepth))
+
+    return accAddr
+
+
+def wtOscPhaseInt(skipInc, accAddr0, accWidth=48):
+    ''' integer phase accumulator - the hardware register model
+        skipInc => int frequency control words (per sample, along last axis)
+        accAddr[0] = accAddr0, accAddr[i+1] = (accAddr[i] + skipInc[i]) & (2**accWidth - 1)
+        uint64 cumsum wraps mod 2**64, masking reduces it mod 2**accWidth
+        exactly (two's complement words give negative frequencies) '''
+
+    accMask = np.uint64(2**accWidth - 1)
+    skipInc = np.asarray(skipInc, dtype=np.int64).view(np.uint64)
+    accAddr = np.empty(skipInc.shape, dtype=np.uint64)
+    accAddr[..., 0] = np.asarray(accAddr0, dtype=np.uint64)
+    np.cumsum(skipInc[..., :-1], axis=-1, out=accAddr[..., 1:])
+    accAddr[..., 1:] += accAddr[..., 0:1]
+    accAddr &= accMask
+
+    return accAddr
+
+
+def wtOscInterp(tb, accAddr, tbLevel=0):
+    ''' interpolated wavetable read for an array of accumulator addresses
+        (table units, 0 <= accAddr < depth, any shape)
+        tb => (depth,) table or (levels, depth) mip-map, tbLevel => level
+              per address (broadcast to accAddr)
+        matches the odmkWTOsc1 hardware model: y = yLow + (yHigh - yLow) *
+        (frac + 1), the last table entry is output as is (no wrap read) '''
+
+    tb = np.atleast_2d(tb)
+    tableDepth = tb.shape[1]
+    # yHigh - yLow per address, 0 for the last entry (output tb[depth-1])
+    tbDiff = np.zeros(tb.shape)
+    tbDiff[:, 0:tableDepth-1] = np.diff(tb, axis=1)
+    # accAddr >= 0: truncation == floor
+    qntAddr = accAddr.astype(np.intp)
+    np.minimum(qntAddr, tableDepth - 1, out=qntAddr)
+    tbAddr = qntAddr + np.asarray(tbLevel, dtype=np.intp) * tableDepth if np.any(tbLevel) else qntAddr
+    wtOut = np.take(tbDiff, tbAddr)
+    wtOut *= (accAddr - qntAddr) + 1.0
+    wtOut += np.take(tb, tbAddr)
+
+    return wtOut
+
+
+def wtBankBlockSize(numVoices):
+    ''' default oscillator bank block length - ~2^16 voice samples per block '''
+
+    return max(256, 2**16 // max(numVoices, 1))
+
+
+def wtOscAddr(freqCtrl, phaseCtrl, accCarry, blkShape, tableDepth, fs, accInt=False):
+    ''' one block of the odmkWTOsc1 phase accumulator for a bank of voices
+        freqCtrl, phaseCtrl => controls broadcast to blkShape (voices, samples),
+                               ex. (voices, 1) for fixed controls
+        accCarry => (voices,) accumulator state at the block start
+        accInt => integer 48 bit accumulator (bit exact table addresses)
+        returns (accAddr, accAddr90, accCarry) - table address units, and the
+        accumulator state for the next block '''
+
+    # phase offset in whole table steps (rounded, as the hardware)
+    phaseOffset = np.round(((np.asarray(phaseCtrl, dtype=np.float64) * tableDepth) / (2 * np.pi)) % tableDepth) % tableDepth
+    # used to add a 90 deg offset for complex sinusoid generation
+    offset90 = tableDepth / 4
+
+    if accInt == True:
+        # ***integer phase accumulator***
+        accWidth = 48
+        lsbWidth = accWidth - int(np.ceil(np.log2(tableDepth)))
+        accMask = np.uint64(2**accWidth - 1)
+        # frequency control word: skipInc = round(2^accWidth * f / Fs)
+        skipInc = np.broadcast_to(np.rint(np.asarray(freqCtrl, dtype=np.float64) * (2**accWidth / fs)).astype(np.int64), blkShape)
+        accAddrInt = wtOscPhaseInt(skipInc, accCarry, accWidth)
+        accCarry = (accAddrInt[..., -1] + skipInc[..., -1].view(np.uint64)) & accMask
+        accAddrInt = (accAddrInt + (phaseOffset.astype(np.uint64) << np.uint64(lsbWidth))) & accMask
+        accAddr90Int = (accAddrInt + (np.uint64(offset90) << np.uint64(lsbWidth))) & accMask
+        # table address units (exact in float64: < 2^48)
+        accAddr = accAddrInt.astype(np.float64) * 2.0**-lsbWidth
+        accAddr90 = accAddr90Int.astype(np.float64) * 2.0**-lsbWidth
+    else:
+        # ***phase accumulator***
+        # accumulator in table address units (48 bit acc >> 36 lsbs):
+        # acc[i+1] = (acc[i] + depth * f[i] / Fs) % depth
+        skipInc = np.broadcast_to((tableDepth / fs) * np.asarray(freqCtrl, dtype=np.float64), blkShape)
+        accAddr = wtOscPhase(skipInc, accCarry, tableDepth)
+        accCarry = np.mod(accAddr[..., -1] + skipInc[..., -1], tableDepth)
+        # operands in [0, depth): one conditional wrap
+        accAddr += phaseOffset
+        accAddr -= tableDepth * (accAddr >= tableDepth)
+        accAddr90 = accAddr + offset90
+        accAddr90 -= tableDepth * (accAddr90 >= tableDepth)
+
+    return accAddr, accAddr90, accCarry
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
 # /////////////////////////////////////////////////////////////////////////////
 # #############################################################################
 # begin : object definition
@@ -119,93 +373,15 @@ class odmkWavGen1:
     # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
     
     
-    def tablegen(self, shape, depth):        
+    def tablegen(self, shape, depth):
         ''' create look-up table entries for different waveforms
+            returns a writable copy of the cached table (wtTable)
 
-        <<sin, cos, tri, saw-up, saw-dn, exp-up, exp-dn, log-up, log-dn>>
+        <<1: sin, 2: cos, 3: tri, 4: saw-up, 5: saw-dn, 6: chebychev,
+          7: pulse1, 8: pulse2, 9: pulse3, 10: pulse4>>
         '''
 
-        table1 = np.zeros(depth)
-        
-        if shape == 1:    # store 1 cycle of sin
-            t1 = np.linspace(0.0, 1.0, depth+1)
-            t1 = t1[0:depth]          # crops off the last point for proper cyclic table
-            for q in range(depth):
-                table1[q] = np.sin(2 * np.pi*(t1[q]))
-                
-        if shape == 2:    # store 1 cycle of cos
-            t1 = np.linspace(0.0, 1.0, depth+1)
-            t1 = t1[0:depth]          # crops off the last point for proper cyclic table
-            for q in range(depth):
-                table1[q] = np.cos(2 * np.pi*(t1[q]))                
-
-        elif shape == 3:    # store 1 cycle of tri (4 cases to handle arbitrary depth)
-            if depth % 4 == 0:
-                # first quarter cycle + 1
-                table1[0:round(depth/4)+1] = np.linspace(0,1,round(depth/4)+1)
-                # 2nd & 3rd quarter cycles +1 (overwrite last value of previous w/1)
-                table1[round(depth/4):3*(round(depth/4))+1] = np.linspace(1,-1,2*(round(depth/4))+1)
-                triQtrTmp = np.linspace(-1,0,round(depth/4)+1)
-                table1[3*(round(depth/4)):depth] = triQtrTmp[0:len(triQtrTmp)-1]
-            elif depth % 4 == 1:
-                table1[0:round(depth/4)+1] = np.linspace(0,1,round(depth/4)+1)
-                table1[round(depth/4):3*(round(depth/4))+1] = np.linspace(1,-1,2*(round(depth/4))+1)
-                triQtrTmp = np.linspace(-1,0,round(depth/4)+2)
-                table1[3*(round(depth/4)):depth] = triQtrTmp[0:len(triQtrTmp)-1]
-            elif depth % 4 == 2:
-                table1[0:round(depth/4)] = np.linspace(0,1,round(depth/4))
-                table1[round(depth/4)-1:3*(round(depth/4))-1] = np.linspace(1,-1,2*(round(depth/4)))
-                triQtrTmp = np.linspace(-1,0,round(depth/4)+1)
-                table1[3*(round(depth/4))-2:depth] = triQtrTmp[0:len(triQtrTmp)-1]
-            elif depth % 4 == 3:
-                table1[0:round(depth/4)+1] = np.linspace(0,1,round(depth/4)+1)
-                table1[round(depth/4):3*(round(depth/4))+1] = np.linspace(1,-1,2*(round(depth/4))+1)
-                triQtrTmp = np.linspace(-1,0,round(depth/4))
-                table1[3*(round(depth/4)):depth] = triQtrTmp[0:len(triQtrTmp)-1]
-
-        elif shape == 4:    # store 1 cycle of saw-up
-            table1 = np.linspace(-1,1,depth)
-
-        elif shape == 5:    # store 1 cycle of saw-down
-            table1 = np.linspace(1,-1,depth)
-
-        elif shape == 6:    # store 1 cycle of chebychev
-            t1 = np.linspace(0.0, 1.0, depth+1)
-            t1 = t1[0:depth]          # crops off the last point for proper cyclic table
-            for r in range(t1):
-                table1[r] = np.cos(13 * np.acos(t1[r]))
-
-        elif shape == 7:    # store 1 cycle of pulse1
-            t2 = np.linspace(1,0,depth)**3
-            for s in range(t2):
-                table1[s] = np.sin(5 * np.pi*(t2[s]))
-
-        elif shape == 8:    # store 1 cycle of pulse2
-            t2 = np.linspace(1,0,depth)**3
-            for s in range(t2):
-                table1[s] = np.sin(9 * np.pi*(t2[s]))
-
-        elif shape == 9:    # store 1 cycle of pulse3
-            t2 = np.linspace(1,0,depth)**3        
-            for s in range(t2):
-                table1[s] = np.sin(23 * np.pi*(t2[s]))
-
-        elif shape == 10:    # store 1 cycle of pulse4
-            # create a pseudo-symmetrical exponetial pulse
-            # crops off the last point for proper cyclic table
-            t3_1 = np.linspace(0,1,int(np.floor(depth/2)+1))
-            t3_2 = np.linspace(1,0,int(np.ceil(depth/2)+1))
-            t3 = np.concatenate(( t3_1[0:len(t3_1)-1], t3_2[0:len(t3_2)-1] ))**3        
-            for t in range(t3):
-                table1[t] = np.cos(5 * np.pi*(t3[t]))
-
-        else:    # default
-            t1 = np.linspace(0.0, 1.0, depth+1)
-            t1 = t1[0:depth]          # crops off the last point for proper cyclic table
-            for q in range(depth):
-                table1[q] = np.sin(2 * np.pi*(t1[q]))
-        
-        return table1
+        return np.array(wtTable(shape, depth))
 
 
 
@@ -333,7 +509,7 @@ class odmkWavGen1:
 
     # wavetable oscillator function
 
-    def odmkWTOsc1(self, numSamples, shape, freqCtrl, phaseCtrl, quant='None'):
+    def odmkWTOsc1(self, numSamples, shape, freqCtrl, phaseCtrl, quant='None', accInt=False, bandLimit=False):
         
         ''' *--------------------------------------------------------*   
         # odmkWTOsc1: single channel wavetable oscillator
@@ -351,145 +527,139 @@ class odmkWavGen1:
         #
         # If quant != None, quantize output to integer range +/- quant
         #
+        # If accInt == True, the 48 bit phase accumulator is run as integer
+        # registers (uint64, masked to accWidth) with rounded integer
+        # frequency control words - table addresses are bit exact with the
+        # fixed-point accumulator (golden vectors for hardware regression)
+        #
+        # If bandLimit == True, each sample reads the mip-map level of the
+        # table band limited below fs / 2 at its frequency (alias-free)
+        #
+        # vectorized: the phase accumulator sequence is a cumsum of the
+        # per-sample increments, table lookup / interpolation, the 90 deg
+        # output and the square output are array operations (wtOscInterp)
+        #
         # *--------------------------------------------------------* // '''
     
         tableDepth = 4096    
 
-        tb = self.tablegen(shape,tableDepth);
+        if bandLimit == True:
+            tb = wtMipMap(shape, tableDepth)
+        else:
+            tb = wtTable(shape, tableDepth)
 
         Fs = self.fs
 
-        # sample period
-        #T = 1.0 / Fs
-
-        accWidth = 48
-        qntWidth = np.ceil(np.log2(tableDepth))
-        lsbWidth = accWidth - qntWidth    # expect 36
-        lsbWidthScale = 2**lsbWidth
-        lsbWidthUnScale = 2**-lsbWidth
-
-        if not( isinstance(freqCtrl,int) or isinstance(freqCtrl,float) or isinstance(freqCtrl,list) or isinstance(freqCtrl, np.ndarray)):
+        if not isinstance(freqCtrl, (int, float, list, np.number, np.ndarray)):
             print('ERROR (odmkWTOsc1): freqCtrl must be a single freq value, a list, or a numpy array of frequency values')
             return 1            
-        elif ( (isinstance(freqCtrl,list) or isinstance(freqCtrl, np.ndarray)) and len(freqCtrl) < numSamples ):
+        elif isinstance(freqCtrl, (list, np.ndarray)) and len(freqCtrl) < numSamples:
             print('ERROR (odmkWTOsc1): freqCtrl array must be at least numSamples long')
             return 1
-        elif (isinstance(freqCtrl,int) or isinstance(freqCtrl,float)):    # fixed freq
-            # scale freq to match quantizer
-            freqCtrlScale = lsbWidthScale * freqCtrl
-            skipInc = ((2**qntWidth) * freqCtrlScale) / Fs
-        elif (isinstance(freqCtrl,list) or isinstance(freqCtrl, np.ndarray)):     # variable freq
-            freqCtrlScale = lsbWidthScale * freqCtrl[0]           
-            skipInc = ((2**qntWidth) * freqCtrlScale) / Fs
-
-        if not( isinstance(phaseCtrl,int) or isinstance(phaseCtrl,float) or isinstance(phaseCtrl,list) or isinstance(phaseCtrl, np.ndarray)):        
+
+        if not isinstance(phaseCtrl, (int, float, list, np.number, np.ndarray)):
             print('ERROR (odmkWTOsc1): phaseCtrl must be a single phase value, or an array of phase values')
             return 1
-        elif ( (isinstance(phaseCtrl,list) or isinstance(phaseCtrl, np.ndarray)) and len(phaseCtrl) < numSamples ):
+        elif isinstance(phaseCtrl, (list, np.ndarray)) and len(phaseCtrl) < numSamples:
             print('ERROR (odmkWTOsc1): phaseCtrl array must be at least numSamples long')
             return 1
-        # initialize variables so that the OSC starts at the beginning of the table            
-        elif (isinstance(phaseCtrl,int) or isinstance(phaseCtrl,float)):    # fixed phase            
-            # scale phase offset
-            # converts radians into a scaled phase offset to be added to the output of the acc
-            # dependent on the table depth
-            phaseOffset = round( ((phaseCtrl * tableDepth) / (2 * np.pi)) % tableDepth )
-            accAddr = phaseOffset * lsbWidthScale    # init to 'zero plus phase shift'
-        elif (isinstance(phaseCtrl,list) or isinstance(phaseCtrl, np.ndarray)):
-            phaseOffset = round( ((phaseCtrl[0] * tableDepth) / (2 * np.pi)) % tableDepth )
-            accAddr = phaseOffset * lsbWidthScale    # init to 'zero plus phase shift'
-
-        # ***initialize***
-
-        # init osc output vectors
-        odmkOsc = np.zeros([numSamples])
-        odmkOsc90 = np.zeros([numSamples])
-        odmkSqrPulse = np.zeros([numSamples])
-        if quant!='None': 
-            odmkOscQuant = np.zeros([numSamples])
-            
 
-        # used to add a 90 deg offset for complex sinusoid generation
-        offset90 = tableDepth / 4
+        if quant != 'None' and not isinstance(quant, int):
+            print('quantization value must be an integer')
+            return 1
+
+        if isinstance(freqCtrl, (list, np.ndarray)):
+            freqCtrl = np.asarray(freqCtrl[0:numSamples], dtype=np.float64)
+        if isinstance(phaseCtrl, (list, np.ndarray)):
+            phaseCtrl = np.asarray(phaseCtrl[0:numSamples], dtype=np.float64)
 
-        accAddr90 = (offset90 + phaseOffset) * lsbWidthScale    # init to 'zero plus offset90 plus phase shift'
-        qntAddr = int(phaseOffset)
-        qntAddr90 = int(qntAddr + offset90)
-        yLow = tb[qntAddr]
-        yLow90 = tb[qntAddr90]
+        # ***phase accumulator*** (single voice, single block)
+        accAddr, accAddr90, accCarry = wtOscAddr(freqCtrl, phaseCtrl, np.zeros((), dtype=np.uint64 if accInt == True else np.float64),
+                                                 (numSamples,), tableDepth, Fs, accInt)
 
-        # **main loop**
         # ___::((Interpolated WaveTable))::___
         # generates main osc waveform out, 90deg shifted out (sin/cos), square pulse out
-    
-        for i in range(numSamples):    # osc main loop
-            
-            if (isinstance(freqCtrl,list) or isinstance(freqCtrl, np.ndarray)):
-                freqCtrlScale = lsbWidthScale * freqCtrl[i]    # scalar or array
+        tbLevel = wtMipLevel(freqCtrl, tableDepth, Fs) if bandLimit == True else 0
+        odmkOsc = wtOscInterp(tb, accAddr, tbLevel)
+        odmkOsc90 = wtOscInterp(tb, accAddr90, tbLevel)
+        odmkSqrPulse = (odmkOsc >= 0).astype(np.float64)
 
-            accAddrP1 = accAddr + lsbWidthScale
-            accAddr90P1 = accAddr90 + lsbWidthScale
-    
-            # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
-            # generate oscillator output
-            # ///////////////////////////////////////////////////        
-            if (qntAddr == tableDepth-1):     # avoid addr overflow for linear interpolation addressing - should investigate
-                yHigh = tb[qntAddr]
-                yHigh90 = tb[qntAddr90 + 1]
-                odmkOsc[i] = tb[tableDepth-1]
-                # linear interpolation
-                odmkOsc90[i] = yLow90 + (yHigh90-yLow90) * ((accAddr90P1-(qntAddr90 * lsbWidthScale)) * lsbWidthUnScale)
-                # temp
-                #yHigh_tap[i] = yHigh
-                #yHigh90_tap[i] = yHigh90
-            elif (qntAddr90 == tableDepth-1):
-                yHigh = tb[qntAddr + 1]
-                yHigh90 = tb[qntAddr90]
-                # linear interpolation
-                odmkOsc[i] = yLow + (yHigh - yLow) * ((accAddrP1 - (qntAddr * lsbWidthScale)) * lsbWidthUnScale)
-                odmkOsc90[i] = tb[tableDepth-1]
-            else:
-                yHigh = tb[qntAddr + 1]
-                yHigh90 = tb[qntAddr90 + 1]
-                odmkOsc[i] = yLow + (yHigh-yLow) * ((accAddrP1 - (qntAddr * lsbWidthScale)) * lsbWidthUnScale)
-                odmkOsc90[i] = yLow90 + (yHigh90 - yLow90) * ((accAddr90P1 - (qntAddr90 * lsbWidthScale)) * lsbWidthUnScale)
-
-            if quant!='None':
-                if isinstance(quant, int):
-                    odmkOscQuant[i] = int(round(quant*odmkOsc[i]))
-                else:
-                    print('quantization value must be an integer')
-                    return 1
-
-
-            # generate square pulse output
-            if odmkOsc[i] >= 0:
-                odmkSqrPulse[i] = 1
-            else:
-                odmkSqrPulse[i] = 0
-  
-            # phase accumulator
-            #accAddr = (accAddr + skipInc[i]) % 2**accWidth
-            #accAddr90 = (accAddr90 + skipInc[i]) % 2**accWidth
-            accAddr = (accAddr + skipInc) % 2**accWidth
-            accAddr90 = (accAddr90 + skipInc) % 2**accWidth            
-    
-            # quantize
-            qntAddr = int(np.floor(accAddr * lsbWidthUnScale))
-            qntAddr90 = int(np.floor(accAddr90 * lsbWidthUnScale))
-    
-            yLow = tb[qntAddr]
-            yLow90 = tb[qntAddr90]
-            # temp
-            #yLow_tap[i] = yLow
-            #yLow90_tap[i] = yLow90
- 
-        if quant!='None':
+        if quant != 'None':
+            odmkOscQuant = np.round(quant * odmkOsc)
             return odmkOscQuant
         else:
             return odmkOsc, odmkOsc90, odmkSqrPulse
 
 
+    # wavetable oscillator bank functions
+
+    def odmkWTOscBankBlocks(self, numSamples, shape, freqCtrl, phaseCtrl, blockSize='None', accInt=False, bandLimit=False):
+        ''' generator - bank of wavetable oscillators in blocks of samples
+            all voices read one shared table (tablegen runs once) and are
+            rendered in a single 2D pass per block
+            freqCtrl, phaseCtrl => (voices,) fixed or (voices, numSamples)
+                                   variable controls (as odmkWTOsc1 per voice)
+            blockSize => samples per block (the final block may be shorter),
+                         memory is O(voices * blockSize), default keeps
+                         ~2^16 voice samples per block (cache sized)
+            accInt => integer phase accumulator (see odmkWTOsc1)
+            bandLimit => per sample mip-map level selection (see odmkWTOsc1)
+            yields (osc, osc90, sqrPulse), each a (voices, blkLength) array
+            usage:
+            >>for oscBlk, osc90Blk, sqrBlk in tbWavGen.odmkWTOscBankBlocks(numSamples, 1, [110.0, 220.0, 330.0], 0):
+            >>    wavMix = oscBlk.sum(axis=0) '''
+
+        tableDepth = 4096
+        if bandLimit == True:
+            tb = wtMipMap(shape, tableDepth)
+        else:
+            tb = wtTable(shape, tableDepth)
+        Fs = self.fs
+
+        freqCtrl = np.asarray(freqCtrl, dtype=np.float64)
+        phaseCtrl = np.asarray(phaseCtrl, dtype=np.float64)
+        numVoices = max(len(np.atleast_1d(freqCtrl)), len(np.atleast_1d(phaseCtrl)))
+        if freqCtrl.ndim == 2 and freqCtrl.shape[1] < numSamples:
+            raise ValueError('odmkWTOscBankBlocks: freqCtrl must be (voices,) or (voices, numSamples)')
+        if phaseCtrl.ndim == 2 and phaseCtrl.shape[1] < numSamples:
+            raise ValueError('odmkWTOscBankBlocks: phaseCtrl must be (voices,) or (voices, numSamples)')
+        # fixed controls => (voices, 1) columns, broadcast per block
+        freqCtrl = freqCtrl.reshape(freqCtrl.shape[0] if freqCtrl.ndim else 1, -1)
+        phaseCtrl = phaseCtrl.reshape(phaseCtrl.shape[0] if phaseCtrl.ndim else 1, -1)
+
+        if blockSize == 'None':
+            blockSize = wtBankBlockSize(numVoices)
+        accCarry = np.zeros(numVoices, dtype=np.uint64 if accInt == True else np.float64)
+
+        for blkStart in range(0, numSamples, blockSize):
+            blkEnd = min(blkStart + blockSize, numSamples)
+            blkFreq = freqCtrl[:, blkStart:blkEnd] if freqCtrl.shape[1] > 1 else freqCtrl
+            blkPhase = phaseCtrl[:, blkStart:blkEnd] if phaseCtrl.shape[1] > 1 else phaseCtrl
+            accAddr, accAddr90, accCarry = wtOscAddr(blkFreq, blkPhase, accCarry, (numVoices, blkEnd - blkStart), tableDepth, Fs, accInt)
+
+            tbLevel = wtMipLevel(blkFreq, tableDepth, Fs) if bandLimit == True else 0
+            oscBlk = wtOscInterp(tb, accAddr, tbLevel)
+            yield oscBlk, wtOscInterp(tb, accAddr90, tbLevel), (oscBlk >= 0).astype(np.float64)
+
+
+    def odmkWTOscBank(self, numSamples, shape, freqCtrl, phaseCtrl, blockSize='None', accInt=False, bandLimit=False):
+        ''' bank of wavetable oscillators - full length odmkWTOscBankBlocks
+            returns (osc, osc90, sqrPulse), each a (voices, numSamples) array
+            usage:
+            >>freqCtrl = np.linspace(55.0, 880.0, 64)
+            >>bankOsc, bankOsc90, bankSqr = tbWavGen.odmkWTOscBank(numSamples, 1, freqCtrl, 0) '''
+
+        numVoices = max(len(np.atleast_1d(freqCtrl)), len(np.atleast_1d(phaseCtrl)))
+        if blockSize == 'None':
+            blockSize = wtBankBlockSize(numVoices)
+        bankOut = [np.empty((numVoices, numSamples)) for k in range(3)]
+        for blkStart, bankBlk in zip(range(0, numSamples, blockSize), self.odmkWTOscBankBlocks(numSamples, shape, freqCtrl, phaseCtrl, blockSize, accInt, bandLimit)):
+            for k in range(3):
+                bankOut[k][:, blkStart:blkStart + bankBlk[k].shape[1]] = bankBlk[k]
+
+        return tuple(bankOut)
+
+
     # #########################################################################
     # begin : waveform generators
     # #########################################################################
@@ -43,6 +43,7 @@ import native_wav as wavio
 #sys.path.insert(1, 'C:/odmkDev/odmkCode/odmkPython/DSP')
 sys.path.insert(2, rootDir+'DSP')
 import odmkClocks as clks
+import odmkMathUtil as mathutil
 import odmkWavGen1 as wavGen
 
 # temp python debugger - use >>>pdb.set_trace() to set break
@@ -70,19 +71,6 @@ print('// \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\ //')
 # #############################################################################
 # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
 
-# // *---------------------------------------------------------------------* //
-# // *--Math Functions--*
-# // *---------------------------------------------------------------------* //
-
-def cyclicZn(n):
-    ''' calculates the Zn roots of unity '''
-    cZn = np.zeros((n, 1))*(0+0j)    # column vector of zero complex values
-    for k in range(n):
-        # z(k) = e^(((k)*2*pi*1j)/n)        # Define cyclic group Zn points
-        cZn[k] = np.cos(((k)*2*np.pi)/n) + np.sin(((k)*2*np.pi)/n)*1j   # Euler's identity
-
-    return cZn
-    
 
 # /////////////////////////////////////////////////////////////////////////////
 # #############################################################################
@@ -217,7 +205,7 @@ testLFOdual = [LFO_L, LFO_R]
 
 
 numOrtFreqs = 7
-nCzn = cyclicZn(numOrtFreqs)
+nCzn = mathutil.cyclicZn(numOrtFreqs)
 
 
 nOrthogonalArray = np.array([])
@@ -264,7 +252,7 @@ print('generated array of orthogonal sin signals "orthoSinArray"')
 # ex. for cyclicZn(15), we want to use czn[1, 2, 3, ... 7]
 
 numOrthoFreq = 7
-czn = cyclicZn(2*numOrthoFreq + 1)
+czn = mathutil.cyclicZn(2*numOrthoFreq + 1)
 
 orthoFreqArray = np.array([])
 for c in range(1, numOrthoFreq+1):
@@ -22,8 +22,13 @@
 # *****************************************************************************
 
 import os
-import wave
+import mmap
+import struct
+from functools import partial
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+import odmkResample
 
 rootDir = 'C:/odmkDev/odmkCode/odmkPython/'
 audioScrDir = 'C:/odmkDev/odmkCode/odmkPython/audio/wavsrc/'
@@ -33,6 +38,332 @@ audioOutDir = 'C:/odmkDev/odmkCode/odmkPython/audio/wavout/'
 import pdb
 
 
+# // *---------------------------------------------------------------------* //
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# begin : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+# // *---------------------------------------------------------------------* //
+# // *---sample formats
+# // *---------------------------------------------------------------------* //
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# WAVE_FORMAT_EXTENSIBLE sub-format GUID = format tag + this 14 byte tail
+WAVE_SUBFORMAT_GUID = b'\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+# default dwChannelMask per channel count (mono = FC, 5.1 = FL FR FC LFE BL BR,
+# 7.1 adds SL SR) - other counts are written unassigned (0)
+wavChannelMask = {1: 0x4, 2: 0x3, 4: 0x33, 6: 0x3F, 8: 0x63F}
+
+# numpy backed sample types: (format tag, sample bits) => (numpy dtype, offset, scale)
+# float = (sample - offset) * scale
+wavSmplDtype = {(WAVE_FORMAT_PCM, 8): ('u1', 128, 2.0**-7),
+                (WAVE_FORMAT_PCM, 16): ('<i2', 0, 2.0**-15),
+                (WAVE_FORMAT_PCM, 32): ('<i4', 0, 2.0**-31),
+                (WAVE_FORMAT_IEEE_FLOAT, 32): ('<f4', 0, 1.0),
+                (WAVE_FORMAT_IEEE_FLOAT, 64): ('<f8', 0, 1.0)}
+
+
+# // *---------------------------------------------------------------------* //
+# // *---channel interleave / de-interleave
+# // *---------------------------------------------------------------------* //
+
+def wavDeinterleave(smplArr, nChan, interleaved=False, smplOffset=0, smplScale=1.0):
+    ''' de-interleave frame-major samples into float channels
+        smplArr => 1D interleaved samples (any numeric dtype)
+        nChan => number of interleaved channels (1 = mono, 6 = 5.1, ...)
+        interleaved => False: returns a contiguous (nChan, nFrames) array
+                       True: returns the frame-major (nFrames, nChan) array,
+                       a reshape of smplArr - the transpose copy is skipped
+        float = (sample - smplOffset) * smplScale '''
+
+    nFrames = len(smplArr) // nChan
+    smplFrames = smplArr[0:nFrames * nChan].reshape(nFrames, nChan)
+
+    if interleaved:
+        wavFloat = np.empty((nFrames, nChan))
+        smplSrc = smplFrames
+    else:
+        wavFloat = np.empty((nChan, nFrames))
+        smplSrc = smplFrames.T
+
+    if smplOffset != 0:
+        np.subtract(smplSrc, smplOffset, out=wavFloat, dtype=np.float64)
+        wavFloat *= smplScale
+    else:
+        np.multiply(smplSrc, smplScale, out=wavFloat, dtype=np.float64)
+
+    return wavFloat
+
+
+def wavInterleave(wavOut, smplScale=1.0, interleaved=False):
+    ''' interleave float channels into a frame-major array
+        wavOut => (nChan, nFrames) array, 1D array (mono) or, when
+                  interleaved=True, a frame-major (nFrames, nChan) array
+        returns a contiguous (nFrames, nChan) float array scaled by smplScale '''
+
+    wavArr = np.asarray(wavOut, dtype=np.float64)
+    if wavArr.ndim == 1:
+        wavArr = wavArr.reshape(len(wavArr), 1)
+    elif not interleaved:
+        wavArr = wavArr.T
+
+    smplFrames = np.empty(wavArr.shape)
+    np.multiply(wavArr, smplScale, out=smplFrames)
+
+    return smplFrames
+
+
+# // *---------------------------------------------------------------------* //
+# // *---PCM decode
+# // *---------------------------------------------------------------------* //
+
+def smplDecode(wavBytes, nChan, interleaved=False, smplType=wavSmplDtype[(WAVE_FORMAT_PCM, 16)]):
+    ''' decode a numpy backed sample buffer (8/16/32 bit PCM, float32/64)
+        wavBytes => raw interleaved frames
+        nChan => number of interleaved channels
+        interleaved => return frame-major (nFrames, nChan) - see wavDeinterleave
+        smplType => (numpy dtype, offset, scale) entry of wavSmplDtype
+        returns a (nChan, nFrames) float array scaled to +/-1.0 '''
+
+    smplDtype, smplOffset, smplScale = smplType
+    smplWidth = np.dtype(smplDtype).itemsize
+    nFrames = len(memoryview(wavBytes).cast('B')) // (smplWidth * nChan)
+    smplArr = np.frombuffer(wavBytes, dtype=smplDtype, count=nFrames * nChan)
+
+    return wavDeinterleave(smplArr, nChan, interleaved, smplOffset, smplScale)
+
+
+def pcm24Decode(wavBytes, nChan=2, interleaved=False):
+    ''' decode a little-endian 24 bit PCM byte buffer into float samples
+        wavBytes => raw interleaved frames (ex. contents of the data chunk)
+        nChan => number of interleaved channels
+        interleaved => return frame-major (nFrames, nChan) - see wavDeinterleave
+        returns a (nChan, nFrames) float array scaled to +/-1.0 '''
+
+    smplBytes = np.frombuffer(wavBytes, dtype=np.uint8)
+    nFrames = len(smplBytes) // (3 * nChan)
+    nSmpl = nFrames * nChan
+
+    # pad bytes so the last 4 byte word stays inside the buffer
+    smplBuf = np.empty(3 * nSmpl + 4, dtype=np.uint8)
+    smplBuf[0:3 * nSmpl] = smplBytes[0:3 * nSmpl]
+    smplBuf[3 * nSmpl:] = 0
+
+    # overlapping int32 words with a 3 byte stride: each word holds one sample
+    # plus the 1st byte of the next, <<8 drops that byte, >>8 sign extends
+    smplWords = as_strided(smplBuf[0:4].view('<i4'), shape=(nSmpl,), strides=(3,))
+    smplInt = (smplWords << 8) >> 8
+
+    return wavDeinterleave(smplInt, nChan, interleaved, 0, 2.0**-23)
+
+
+# // *---------------------------------------------------------------------* //
+# // *---PCM encode
+# // *---------------------------------------------------------------------* //
+
+def smplEncode(wavOut, interleaved=False, smplType=wavSmplDtype[(WAVE_FORMAT_PCM, 16)]):
+    ''' encode float samples into a numpy backed sample buffer
+        wavOut => (nChan, nFrames) float array scaled to +/-1.0 (1D = mono)
+        interleaved => wavOut is frame-major (nFrames, nChan)
+        smplType => (numpy dtype, offset, scale) entry of wavSmplDtype
+        returns interleaved frames, integer samples are rounded toward zero
+        and clipped to the sample range (same as pcm24Encode) '''
+
+    smplDtype, smplOffset, smplScale = smplType
+
+    if np.dtype(smplDtype).kind == 'f':
+        smplArr = wavInterleave(wavOut, 1.0, interleaved).astype(smplDtype)
+    else:
+        smplMax = 1.0 / smplScale
+        smplFloat = wavInterleave(wavOut, smplMax, interleaved)
+        np.clip(smplFloat, -smplMax, smplMax - 1, out=smplFloat)
+        # round toward zero before the unsigned offset (8 bit PCM), so
+        # negative samples are not floored by the cast
+        np.trunc(smplFloat, out=smplFloat)
+        smplFloat += smplOffset
+        smplArr = smplFloat.astype(smplDtype)
+
+    return smplArr.tobytes()
+
+
+def pcm24Encode(wavOut, interleaved=False):
+    ''' encode float samples into a little-endian 24 bit PCM byte buffer
+        wavOut => (nChan, nFrames) float array scaled to +/-1.0 (1D = mono)
+        interleaved => wavOut is frame-major (nFrames, nChan)
+        returns interleaved frames ready to write to the data chunk
+        samples are scaled by 2**23, rounded toward zero (same as int())
+        and clipped to the 24 bit range [-2**23, 2**23-1] '''
+
+    # interleave to (frame, channel) while scaling
+    smplFloat = wavInterleave(wavOut, 2**23, interleaved)
+    np.clip(smplFloat, -2**23, 2**23 - 1, out=smplFloat)
+    # float => int cast rounds toward zero
+    smplInt = smplFloat.astype('<i4')
+
+    # keep the low 3 bytes of each little-endian int32 word
+    smplBytes = smplInt.view(np.uint8).reshape(smplInt.size, 4)[:, 0:3]
+
+    return smplBytes.tobytes()
+
+
+# // *---------------------------------------------------------------------* //
+# // *---codec table
+# // *---------------------------------------------------------------------* //
+
+# (format tag, sample bits) => (decode, encode)
+# decode(wavBytes, nChan, interleaved=False) => (nChan, nFrames) float array
+# encode(wavOut, interleaved=False) => interleaved frame bytes
+wavCodec = {(WAVE_FORMAT_PCM, 24): (pcm24Decode, pcm24Encode)}
+for wavFmtKey, wavSmplType in wavSmplDtype.items():
+    wavCodec[wavFmtKey] = (partial(smplDecode, smplType=wavSmplType),
+                           partial(smplEncode, smplType=wavSmplType))
+
+
+def wavCodecLookup(fFormatTag, fSampleBits):
+    ''' returns the (decode, encode) pair for a format tag / sample width '''
+
+    if (fFormatTag, fSampleBits) not in wavCodec:
+        raise ValueError('unsupported wav sample format (format tag = '+str(fFormatTag)+', bits = '+str(fSampleBits)+')')
+
+    return wavCodec[(fFormatTag, fSampleBits)]
+
+
+# // *---------------------------------------------------------------------* //
+# // *---RIFF header parse
+# // *---------------------------------------------------------------------* //
+
+
+def wavHeader(wavInFull):
+    ''' parse the RIFF/WAVE header of a .wav file without reading samples
+        wavInFull = full path of the .wav file
+        returns the wavRead parameter dict extended with:
+        fFormatTag => WAVE_FORMAT_PCM or WAVE_FORMAT_IEEE_FLOAT
+                      (WAVE_FORMAT_EXTENSIBLE is resolved to its sub-format)
+        fBlockAlign => bytes per frame
+        fDataOffset => byte offset of the 1st sample of the data chunk
+        fDataSize => byte size of the data chunk '''
+
+    with open(wavInFull, 'rb') as fwav:
+        riffHdr = fwav.read(12)
+        if len(riffHdr) < 12 or riffHdr[0:4] != b'RIFF' or riffHdr[8:12] != b'WAVE':
+            raise ValueError('wavHeader: '+wavInFull+' is not a RIFF/WAVE file')
+        fFileSize = os.fstat(fwav.fileno()).st_size
+
+        wavFmt = None
+        while True:
+            chunkHdr = fwav.read(8)
+            if len(chunkHdr) < 8:
+                raise ValueError('wavHeader: no data chunk found in '+wavInFull)
+            chunkId, chunkSize = struct.unpack('<4sI', chunkHdr)
+
+            if chunkId == b'fmt ':
+                wavFmt = fwav.read(chunkSize)
+                fwav.seek(chunkSize % 2, 1)
+            elif chunkId == b'data':
+                if wavFmt is None:
+                    raise ValueError('wavHeader: data chunk before fmt chunk in '+wavInFull)
+                fDataOffset = fwav.tell()
+                # streamed files may leave the size unpatched (0 or 0xFFFFFFFF)
+                fDataSize = fFileSize - fDataOffset
+                if 0 < chunkSize < fDataSize:
+                    fDataSize = chunkSize
+                break
+            else:
+                fwav.seek(chunkSize + chunkSize % 2, 1)
+
+    if len(wavFmt) < 16:
+        raise ValueError('wavHeader: truncated fmt chunk in '+wavInFull)
+    fFormatTag, fChannels, fSampleRate, fByteRate, fBlockAlign, fSampleBits = struct.unpack('<HHIIHH', wavFmt[0:16])
+    if fChannels == 0 or fBlockAlign == 0:
+        raise ValueError('wavHeader: invalid fmt chunk (channels = '+str(fChannels)+', block align = '
+                         +str(fBlockAlign)+') in '+wavInFull)
+    if fFormatTag == WAVE_FORMAT_EXTENSIBLE and len(wavFmt) >= 40:
+        # 1st 2 bytes of the sub-format GUID hold the actual format tag
+        fFormatTag = struct.unpack('<H', wavFmt[24:26])[0]
+
+    wavIn_param = {'fSampleRate': fSampleRate, 'fSampleBits': fSampleBits, 'fChannels': fChannels,
+                   'fNumSamples': fDataSize // fBlockAlign, 'fFormatTag': fFormatTag,
+                   'fBlockAlign': fBlockAlign, 'fDataOffset': fDataOffset, 'fDataSize': fDataSize}
+
+    return wavIn_param
+
+
+def wavHeaderPack(fs, nChan, fSampleBits, fFormatTag, dataSize):
+    ''' pack a RIFF/WAVE header (fmt [+ fact] + data chunk headers)
+        dataSize => byte size of the data chunk (sizes saturate at 4GB)
+        more than 2 channels or more than 16 bits are written as
+        WAVE_FORMAT_EXTENSIBLE (wavChannelMask), non-PCM formats get the
+        cbSize field and a fact chunk - the header length only depends on
+        (nChan, fSampleBits, fFormatTag) so it can be patched in place '''
+
+    fBlockAlign = nChan * fSampleBits // 8
+    fmtHdr = struct.pack('<IIHH', int(fs), int(fs) * fBlockAlign, fBlockAlign, fSampleBits)
+    if nChan > 2 or fSampleBits > 16:
+        wavFmt = (struct.pack('<HH', WAVE_FORMAT_EXTENSIBLE, nChan) + fmtHdr
+                  + struct.pack('<HHIH', 22, fSampleBits, wavChannelMask.get(nChan, 0), fFormatTag)
+                  + WAVE_SUBFORMAT_GUID)
+    elif fFormatTag != WAVE_FORMAT_PCM:
+        wavFmt = struct.pack('<HH', fFormatTag, nChan) + fmtHdr + struct.pack('<H', 0)
+    else:
+        wavFmt = struct.pack('<HH', fFormatTag, nChan) + fmtHdr
+
+    wavHdr = b'fmt ' + struct.pack('<I', len(wavFmt)) + wavFmt
+    if fFormatTag != WAVE_FORMAT_PCM:
+        wavHdr += struct.pack('<4sII', b'fact', 4, min(dataSize // fBlockAlign, 0xFFFFFFFF))
+    wavHdr += struct.pack('<4sI', b'data', min(dataSize, 0xFFFFFFFF))
+
+    riffSize = min(4 + len(wavHdr) + dataSize + dataSize % 2, 0xFFFFFFFF)
+    return struct.pack('<4sI4s', b'RIFF', riffSize, b'WAVE') + wavHdr
+
+
+# // *---------------------------------------------------------------------* //
+# // *---block re-framing
+# // *---------------------------------------------------------------------* //
+
+def wavReblock(wavChunks, nChan, blockSize, hopSize, padEnd=True):
+    ''' generator - re-frame a stream of (nChan, n) chunks of any size into
+        (nChan, blockSize) blocks starting every hopSize frames
+        padEnd => zero-pad and yield the final partial block '''
+
+    wavBuf = np.zeros((nChan, 0))
+    # frames to drop before the next block (hopSize > blockSize)
+    nSkip = 0
+    # frames in wavBuf not yet part of a yielded block
+    nNew = 0
+
+    for wavChunk in wavChunks:
+        if nSkip > 0:
+            nDrop = min(nSkip, wavChunk.shape[1])
+            wavChunk = wavChunk[:, nDrop:]
+            nSkip -= nDrop
+        wavBuf = np.concatenate((wavBuf, wavChunk), axis=1)
+        nNew += wavChunk.shape[1]
+
+        while wavBuf.shape[1] >= blockSize:
+            yield wavBuf[:, 0:blockSize]
+            nDrop = min(hopSize, wavBuf.shape[1])
+            wavBuf = wavBuf[:, nDrop:]
+            nSkip = hopSize - nDrop
+            nNew = max(wavBuf.shape[1] - max(blockSize - hopSize, 0), 0)
+
+    if padEnd and nNew > 0:
+        wavPad = np.zeros((nChan, blockSize - wavBuf.shape[1]))
+        yield np.concatenate((wavBuf, wavPad), axis=1)
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : function definitions
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
 # // *---------------------------------------------------------------------* //
 
 # /////////////////////////////////////////////////////////////////////////////
@@ -61,12 +392,18 @@ class odmkWavIO:
     # // *---gen simple periodic sin waveforms (sigLength # samples)
     # // *-----------------------------------------------------------------* //
 
-    def wavRead(self, wavIn, wavInDir, wavLength='None'):
-        ''' read a 24 bit wav file into wavOutDir
+    def wavRead(self, wavIn, wavInDir, wavLength='None', interleaved=False, fsOut='None'):
+        ''' read a wav file (8/16/24/32 bit PCM, float32/64) into wavOutDir
             wavOut = output file name (txt)
             wavOutDir = output directory (created if doesn't exist)
             fs = sample rate
             wavLength = optional truncated length of output .wav in seconds
+            interleaved = False: returns a contiguous (channels, frames) array
+                          True: returns the frame-major (frames, channels)
+                          array without the de-interleave copy
+            fsOut = optional output sample rate - the samples are resampled
+                    (odmkResample) and fSampleRate / fNumSamples of the
+                    returned parameters describe the resampled data
             usage:
             >>tbWavIO = sigGen.odmkSigGen1(numSamples, fs) '''
 
@@ -74,58 +411,177 @@ class odmkWavIO:
 
         wavInFull = wavInDir+wavIn
 
-        fwav = wave.open(wavInFull, 'r')
-  
-        fSampleRate = fwav.getframerate()
-        fSampleWidth = fwav.getsampwidth()
-        fSampleBits = 8*fSampleWidth
-        fChannels = fwav.getnchannels()
-        fNumSamples = fwav.getnframes()
-        # fparams = fwav.getparams()
-        
-        wavIn_param = {'fSampleRate': fSampleRate, 'fSampleBits': fSampleBits, 'fChannels': fChannels, 'fNumSamples': fNumSamples}
-
-
-        wavIn_bytes = fwav.readframes(fNumSamples)
-
-        fwav.close()
-
-        wavIn_bytesL = bytearray([])
-        wavIn_bytesR = bytearray([])
-        wavIn_smplL = 0
-        wavIn_smplR = 0
-        wavIn_L = np.array([])
-        wavIn_R = np.array([])
-        wavIn_stereo = np.array([])
-
-        # de-interleave bytes to L/R channels - convert to float - scale to +/-1.0 
-        for ii in range(len(wavIn_bytes)):
-            if (ii % 6) < 3:
-                wavIn_bytesL.append(wavIn_bytes[ii])
-            else:
-                wavIn_bytesR.append(wavIn_bytes[ii])
-            if (((ii+1) % 6) == 0):
-                wavIn_smplL = int.from_bytes(wavIn_bytesL, byteorder='little', signed=True)
-                wavIn_smplR = int.from_bytes(wavIn_bytesR, byteorder='little', signed=True)
-                wavIn_smplL = float(wavIn_smplL / 2**23)
-                wavIn_smplR = float(wavIn_smplR / 2**23)
-                wavIn_L = np.append(wavIn_L, wavIn_smplL)
-                wavIn_R = np.append(wavIn_R, wavIn_smplR)       
-                wavIn_bytesL = bytearray([])
-                wavIn_bytesR = bytearray([])    
-        wavIn_stereo = np.array([wavIn_L, wavIn_R])
-
-        return wavIn_stereo, wavIn_param
+        wavIn_param = wavHeader(wavInFull)
+        fChannels = wavIn_param['fChannels']
+        fNumSamples = wavIn_param['fNumSamples']
+
+        wavDecode = wavCodecLookup(wavIn_param['fFormatTag'], wavIn_param['fSampleBits'])[0]
+
+        with open(wavInFull, 'rb') as fwav:
+            fwav.seek(wavIn_param['fDataOffset'])
+            wavIn_bytes = fwav.read(fNumSamples * wavIn_param['fBlockAlign'])
+
+        if fsOut != 'None' and fsOut != wavIn_param['fSampleRate']:
+            wavIn_smpl = odmkResample.resample(wavDecode(wavIn_bytes, fChannels), wavIn_param['fSampleRate'], fsOut)
+            wavIn_param['fSampleRate'] = fsOut
+            wavIn_param['fNumSamples'] = wavIn_smpl.shape[1]
+            if interleaved:
+                wavIn_smpl = wavIn_smpl.T
+            return wavIn_smpl, wavIn_param
+
+        # de-interleave bytes to channels - convert to float - scale to +/-1.0
+        wavIn_smpl = wavDecode(wavIn_bytes, fChannels, interleaved=interleaved)
+
+        return wavIn_smpl, wavIn_param
+
+    # // *-----------------------------------------------------------------* //
+    # // *---streaming block read (bounded memory)
+    # // *-----------------------------------------------------------------* //
+
+    def wavReadBlocks(self, wavIn, wavInDir, blockSize=4096, hopSize='None', padEnd=True, fsOut='None'):
+        ''' generator - read a wav file as a sequence of float blocks
+            wavIn = input file name
+            wavInDir = input directory
+            blockSize = number of frames per output block
+            hopSize = frames between the start of successive blocks
+                      (default = blockSize: no overlap, hopSize < blockSize
+                      overlaps blocks, hopSize > blockSize skips frames)
+            padEnd = zero-pad and yield the final partial block
+            fsOut = optional output sample rate - the stream is resampled
+                    (odmkResample) before blocking, blockSize / hopSize
+                    are then counted at fsOut
+            yields (fChannels, blockSize) float arrays scaled to +/-1.0,
+            only ~blockSize frames are held in memory at any time
+            usage:
+            >>for wavBlock in tbWavIO.wavReadBlocks(wavIn, wavInDir, 1024, 512):
+            >>    wavSpec = np.fft.rfft(wavBlock[0]) '''
+
+        if hopSize == 'None':
+            hopSize = blockSize
+        if blockSize < 1 or hopSize < 1:
+            print('ERROR (wavReadBlocks): blockSize and hopSize must be >= 1')
+            return
+
+        wavInFull = wavInDir+wavIn
+
+        wavIn_param = wavHeader(wavInFull)
+        fChannels = wavIn_param['fChannels']
+        fBlockAlign = wavIn_param['fBlockAlign']
+
+        wavDecode = wavCodecLookup(wavIn_param['fFormatTag'], wavIn_param['fSampleBits'])[0]
+
+        fwav = open(wavInFull, 'rb')
+        fwav.seek(wavIn_param['fDataOffset'])
+
+        if fsOut != 'None' and fsOut != wavIn_param['fSampleRate']:
+            try:
+                # decode whole chunks -> streaming resampler -> re-frame
+                def wavChunks(framesLeft):
+                    while framesLeft > 0:
+                        nRead = min(blockSize, framesLeft)
+                        yield wavDecode(fwav.read(nRead * fBlockAlign), fChannels)
+                        framesLeft -= nRead
+
+                wavSRC = odmkResample.odmkResampler(wavIn_param['fSampleRate'], fsOut)
+                yield from wavReblock(wavSRC.stream(wavChunks(wavIn_param['fNumSamples'])),
+                                      fChannels, blockSize, hopSize, padEnd)
+            finally:
+                fwav.close()
+            return
+
+        try:
+            # frames left in the data chunk
+            framesLeft = wavIn_param['fNumSamples']
+
+            # frames shared with the previous block (overlap)
+            wavCarry = np.zeros((fChannels, 0))
+
+            while True:
+                nRead = blockSize - wavCarry.shape[1]
+                wavNew = wavDecode(fwav.read(min(nRead, framesLeft) * fBlockAlign), fChannels)
+                framesLeft -= wavNew.shape[1]
+                wavBlock = np.concatenate((wavCarry, wavNew), axis=1)
+
+                if wavNew.shape[1] < nRead:
+                    # end of file - only yield a block holding new frames
+                    if padEnd and wavNew.shape[1] > 0:
+                        wavPad = np.zeros((fChannels, blockSize - wavBlock.shape[1]))
+                        yield np.concatenate((wavBlock, wavPad), axis=1)
+                    break
+
+                yield wavBlock
+
+                if hopSize < blockSize:
+                    wavCarry = wavBlock[:, hopSize:]
+                else:
+                    wavCarry = np.zeros((fChannels, 0))
+                    nSkip = min(hopSize - blockSize, framesLeft)
+                    fwav.seek(nSkip * fBlockAlign, 1)
+                    framesLeft -= nSkip
+        finally:
+            fwav.close()
+
+    # // *---memory-mapped read (random access, decode on slice)
+    # // *-----------------------------------------------------------------* //
+
+    def wavMap(self, wavIn, wavInDir):
+        ''' memory-map a wav file - returns an odmkWavMap array-like view
+            wavIn = input file name
+            wavInDir = input directory
+            only the header is parsed, samples are decoded when sliced
+            usage:
+            >>wavA = tbWavIO.wavMap(wavIn, wavInDir)
+            >>wavBeat = wavA[:, beatIdx:beatIdx+tbClocks.samplesPerBeat] '''
+
+        return odmkWavMap(wavInDir+wavIn)
+
+    # // *-----------------------------------------------------------------* //
+    # // *---streaming block write (bounded memory)
+    # // *-----------------------------------------------------------------* //
+
+    def wavWriter(self, wavOutNm, wavOutDir, fs, channels=2, sampleBits=24, formatTag=WAVE_FORMAT_PCM):
+        ''' open an odmkWavWriter for incremental output into wavOutDir
+            wavOutNm = output file name
+            wavOutDir = output directory (created if doesn't exist)
+            fs = sample rate
+            channels = number of channels
+            sampleBits = 8/16/24/32 (PCM), 32/64 (WAVE_FORMAT_IEEE_FLOAT)
+            formatTag = WAVE_FORMAT_PCM or WAVE_FORMAT_IEEE_FLOAT
+            usage:
+            >>with tbWavIO.wavWriter(wavOutNm, wavOutDir, fs) as wavW:
+            >>    for wavBlock in wavBlocks:
+            >>        wavW.write(wavBlock) '''
+
+        os.makedirs(wavOutDir, exist_ok=True)
+
+        return odmkWavWriter(wavOutDir+wavOutNm, fs, channels, sampleBits, formatTag)
+
+    def wavWriteBlocks(self, wavBlocks, wavOutNm, wavOutDir, fs, channels=2, sampleBits=24, formatTag=WAVE_FORMAT_PCM):
+        ''' write an iterable / generator of (channels, n) float blocks to a
+            wav file - blocks are written as they are produced
+            returns the total number of frames written '''
+
+        with self.wavWriter(wavOutNm, wavOutDir, fs, channels, sampleBits, formatTag) as wavW:
+            for wavBlock in wavBlocks:
+                wavW.write(wavBlock)
+
+        return wavW.fNumSamples
 
 # // *---------------------------------------------------------------------* //        
 
-    def wavWrite(self, wavOut, wavOutNm, wavOutDir, fs, channels='None', wavLength='None'):
-        ''' write a 24 bit wav file into wavOutDir
-            wavOut = stereo or mono 24-bit sample numpy array
+    def wavWrite(self, wavOut, wavOutNm, wavOutDir, fs, channels='None', wavLength='None',
+                 sampleBits=24, formatTag=WAVE_FORMAT_PCM, interleaved=False):
+        ''' write a wav file into wavOutDir
+            wavOut = (channels, frames) float sample numpy array (+/-1.0),
+                     any number of channels - 1D array for mono
             wavOutNm = output file name
             wavOutDir = output directory (created if doesn't exist)
             fs = sample rate
-            wavLength = optional truncated length of output .wav in seconds
+            channels = optional check of the number of channels in wavOut
+            wavLength = optional truncated length of output .wav in samples
+            sampleBits = 8/16/24/32 (PCM), 32/64 (WAVE_FORMAT_IEEE_FLOAT)
+            formatTag = WAVE_FORMAT_PCM or WAVE_FORMAT_IEEE_FLOAT
+            interleaved = wavOut is frame-major (frames, channels)
             usage:
             >>tbWavIO = sigGen.odmkSigGen1(numSamples, fs) '''
 
@@ -134,63 +590,230 @@ class odmkWavIO:
         os.makedirs(wavOutDir, exist_ok=True)
         wavOutFull = wavOutDir+wavOutNm
 
+        wavArr = np.asarray(wavOut)
+        if wavArr.ndim == 1:
+            wavArr = wavArr.reshape(1, len(wavArr))
+        elif interleaved:
+            wavArr = wavArr.T
+
         fSampleRate = fs
-        if channels!='None':
-            if (channels < 1 or channels > 2):
-                print('ERROR: channels must be either 1 or 2')
-                return
-            else:
-                fChannels = channels
-        else:
-            fChannels = 2
+        fChannels = wavArr.shape[0]
+        if channels != 'None' and channels != fChannels:
+            print('ERROR: channels must match the number of wavOut channels ('+str(fChannels)+')')
+            return
         if wavLength != 'None':
-            if wavLength > wavOut[0]:
+            if wavLength > wavArr.shape[1]:
                 print('ERROR: wavLength must be less than length of wavIn')
                 return
             else:
                 fNumSamples = wavLength
         else:
-            fNumSamples = len(wavOut[0])
-
-        #pdb.set_trace()               
-
-        wavOut_L = wavOut[0]
-        wavOut_R = wavOut[1]
-
-        wavOut_bytesL = bytearray(3)
-        wavOut_bytesR = bytearray(3)
-        wavOut = bytearray([])
-        wavOut_smplL = 0
-        wavOut_smplR = 0
-        
-        # interleave bytes to L/R channels - convert to float - scale to +/-1.0 
-        for jj in range(len(wavOut_L)):
-            wavOut_smplL = int(wavOut_L[jj] * 2**23)
-            wavOut_smplR = int(wavOut_R[jj] * 2**23)
-            wavOut_bytesL = wavOut_smplL.to_bytes(3, byteorder='little', signed=True)
-            for kk in range(3):    
-                wavOut.append(wavOut_bytesL[kk])
-            wavOut_bytesR = wavOut_smplR.to_bytes(3, byteorder='little', signed=True)   
-            for kk in range(3):    
-                wavOut.append(wavOut_bytesR[kk])          
-            wavOut_bytesL = bytearray([])
-            wavOut_bytesR = bytearray([])
-        
-        fwav = wave.open(wavOutFull, 'w')
-        
-        fwav.setframerate(fSampleRate)    # set the frame rate
-        fwav.setsampwidth(3)            # the sample width (bytes per sample)
-        fwav.setnchannels(fChannels)    # set the number of channels
-        fwav.setnframes(fNumSamples)    # set the number of frames
-        
-        # fwav.setparams(fparams)    # set all parameters at once
-
-        fwav.writeframes(wavOut)    # write audio frames and patch up the file header
-        
-        fwav.close()    # patch up the file header and close the output file
+            fNumSamples = wavArr.shape[1]
+
+        # interleave channels - encode - write & patch up the file header
+        with odmkWavWriter(wavOutFull, fSampleRate, fChannels, sampleBits, formatTag) as wavW:
+            wavW.write(wavArr[:, 0:fNumSamples])
 
         return
 
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : object definition
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# begin : object definition
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+class odmkWavMap:
+    ''' memory-mapped read only view of a .wav file data chunk
+        usage: wavA = odmkWavMap(wavInFull)
+        wavA.shape => (fChannels, fNumSamples) - same layout as wavRead
+        wavA[:, n0:n1] => decodes only frames n0:n1 to float (+/-1.0)
+        wavA.frames => zero-copy (frames, channels) numpy view of the raw
+                       samples (8/16/32 bit PCM, float32/64), None for 24 bit
+        wavA.close() => release the file (also via 'with odmkWavMap(..) as')
+    '''
+
+    def __init__(self, wavInFull):
+
+        self.wavParam = wavHeader(wavInFull)
+        self.fChannels = self.wavParam['fChannels']
+        self.fNumSamples = self.wavParam['fNumSamples']
+        self.shape = (self.fChannels, self.fNumSamples)
+
+        fFormatTag = self.wavParam['fFormatTag']
+        fSampleBits = self.wavParam['fSampleBits']
+        self.wavDecode = wavCodecLookup(fFormatTag, fSampleBits)[0]
+
+        self.fwav = open(wavInFull, 'rb')
+        self.wavMM = mmap.mmap(self.fwav.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # (frames, bytes per frame) view of the data chunk
+        fBlockAlign = self.wavParam['fBlockAlign']
+        self.frameBytes = np.frombuffer(self.wavMM, dtype=np.uint8, count=self.fNumSamples * fBlockAlign,
+                                        offset=self.wavParam['fDataOffset']).reshape(self.fNumSamples, fBlockAlign)
+
+        if (fFormatTag, fSampleBits) in wavSmplDtype:
+            self.frames = self.frameBytes.view(wavSmplDtype[(fFormatTag, fSampleBits)][0])
+        else:
+            self.frames = None
+
+    def __len__(self):
+        return self.fChannels
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def __array__(self, dtype=None, copy=None):
+        wavFull = self.decode(0, self.fNumSamples)
+        if dtype is not None:
+            wavFull = wavFull.astype(dtype)
+        return wavFull
+
+    def decode(self, frameStart, frameStop):
+        ''' decode frames [frameStart, frameStop) into a (fChannels, n) float array '''
+
+        return self.wavDecode(self.frameBytes[frameStart:frameStop], self.fChannels)
+
+    def __getitem__(self, key):
+
+        if isinstance(key, tuple):
+            chanKey, frameKey = key
+        else:
+            chanKey, frameKey = key, slice(None)
+
+        # decode the smallest frame range covering frameKey, then index into it
+        if isinstance(frameKey, slice):
+            frameRange = range(*frameKey.indices(self.fNumSamples))
+            if len(frameRange) == 0:
+                return self.decode(0, 0)[chanKey]
+            frameLo = min(frameRange[0], frameRange[-1])
+            frameHi = max(frameRange[0], frameRange[-1]) + 1
+            if frameRange.step > 0:
+                frameKey = slice(frameRange.start - frameLo, frameRange.stop - frameLo, frameRange.step)
+            else:
+                frameKey = slice(frameRange.start - frameLo, None, frameRange.step)
+        elif np.ndim(frameKey) == 0:
+            frameLo = int(frameKey) + self.fNumSamples if frameKey < 0 else int(frameKey)
+            if frameLo < 0 or frameLo >= self.fNumSamples:
+                raise IndexError('odmkWavMap: frame index '+str(frameKey)+' out of range')
+            frameHi = frameLo + 1
+            frameKey = 0
+        else:
+            frameKey = np.asarray(frameKey)
+            if frameKey.dtype == bool:
+                frameKey = np.flatnonzero(frameKey)
+            frameKey = np.where(frameKey < 0, frameKey + self.fNumSamples, frameKey)
+            if len(frameKey) == 0:
+                return self.decode(0, 0)[chanKey]
+            frameLo = int(frameKey.min())
+            frameHi = int(frameKey.max()) + 1
+            if frameLo < 0 or frameHi > self.fNumSamples:
+                raise IndexError('odmkWavMap: frame index out of range')
+            frameKey = frameKey - frameLo
+
+        return self.decode(frameLo, frameHi)[chanKey, frameKey]
+
+    def close(self):
+        ''' release the memory map and file handle '''
+
+        self.frames = None
+        self.frameBytes = None
+        try:
+            self.wavMM.close()
+        except BufferError:
+            # zero-copy views handed out are still alive - the map is
+            # released when the last of them is garbage collected
+            pass
+        self.fwav.close()
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : object definition
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# begin : object definition
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+class odmkWavWriter:
+    ''' incremental .wav writer
+        blocks are encoded and written to disk as they arrive, the RIFF and
+        data chunk sizes are patched on close
+        usage: wavW = odmkWavWriter(wavOutFull, fs, channels=2, sampleBits=24,
+                                    formatTag=WAVE_FORMAT_PCM)
+        wavW.write(wavBlock) => (channels, n) float block scaled to +/-1.0
+                                (1D arrays are accepted for mono)
+        wavW.close() => patch up the file header and close the output file
+    '''
+
+    def __init__(self, wavOutFull, fs, channels=2, sampleBits=24, formatTag=WAVE_FORMAT_PCM):
+
+        self.wavOutFull = wavOutFull
+        self.fs = fs
+        self.fChannels = channels
+        self.fSampleBits = sampleBits
+        self.fFormatTag = formatTag
+        self.wavEncode = wavCodecLookup(formatTag, sampleBits)[1]
+        self.fNumSamples = 0
+        self.dataSize = 0
+
+        self.fwav = open(wavOutFull, 'wb')
+        # placeholder header - sizes are patched on close
+        self.fwav.write(wavHeaderPack(fs, channels, self.fSampleBits, self.fFormatTag, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def write(self, wavBlock):
+        ''' encode and append a (channels, n) float block '''
+
+        wavBlock = np.asarray(wavBlock)
+        if wavBlock.ndim == 1:
+            wavBlock = wavBlock.reshape(1, len(wavBlock))
+        if wavBlock.shape[0] != self.fChannels:
+            raise ValueError('odmkWavWriter: block has '+str(wavBlock.shape[0])+' channels, expected '+str(self.fChannels))
+
+        wavBytes = self.wavEncode(wavBlock)
+        self.fwav.write(wavBytes)
+        self.fNumSamples += wavBlock.shape[1]
+        self.dataSize += len(wavBytes)
+
+    def close(self):
+        ''' pad the data chunk to an even size, patch the header sizes and close '''
+
+        if self.fwav.closed:
+            return
+        if self.dataSize % 2:
+            self.fwav.write(b'\x00')
+        self.fwav.seek(0)
+        self.fwav.write(wavHeaderPack(self.fs, self.fChannels, self.fSampleBits, self.fFormatTag, self.dataSize))
+        self.fwav.close()
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : object definition
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
 # // *---------------------------------------------------------------------* //
 
 # print('\n')
@@ -39,10 +39,12 @@ import odmkPlotUtil as odmkplt
 #sys.path.insert(1, 'C:/odmkDev/odmkCode/odmkPython/DSP')
 sys.path.insert(1, rootDir+'audio')
 import odmkWavIO as waveio
+import odmkResample as resamp
 
 #sys.path.insert(1, 'C:/odmkDev/odmkCode/odmkPython/DSP')
 sys.path.insert(2, rootDir+'DSP')
 import odmkClocks as clks
+import odmkMathUtil as mathutil
 import odmkSigGen1 as sigGen
 
 # temp python debugger - use >>>pdb.set_trace() to set break
@@ -61,19 +63,6 @@ clear_all()
 # \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
 
 
-# // *---------------------------------------------------------------------* //
-# // *--Math Functions--*
-# // *---------------------------------------------------------------------* //
-
-def cyclicZn(n):
-    ''' calculates the Zn roots of unity '''
-    cZn = np.zeros((n, 1))*(0+0j)    # column vector of zero complex values
-    for k in range(n):
-        # z(k) = e^(((k)*2*pi*1j)/n)        # Define cyclic group Zn points
-        cZn[k] = np.cos(((k)*2*np.pi)/n) + np.sin(((k)*2*np.pi)/n)*1j   # Euler's identity
-
-    return cZn
-
 # /////////////////////////////////////////////////////////////////////////////
 # #############################################################################
 # end : function definitions
@@ -159,6 +148,102 @@ print('// *--------------------------------------------------------------* //')
 #    print('ERROR: cloning unsuccessful, byte error count = '+str(byteErrorCnt))
 
 
+# 24 bit decode - vectorized pcm24Decode vs the per-sample int.from_bytes loop
+
+wavC_param = waveio.wavHeader(wavfile_dir+wavfile_clone)
+with open(wavfile_dir+wavfile_clone, 'rb') as fwav:
+    fwav.seek(wavC_param['fDataOffset'])
+    wavC_bytes = fwav.read(wavC_param['fDataSize'])
+
+wavC_channels = wavC_param['fChannels']
+wavC_ref = np.zeros((wavC_channels, wavC_param['fNumSamples']))
+for ii in range(wavC_param['fNumSamples'] * wavC_channels):
+    wavC_smpl = int.from_bytes(wavC_bytes[3*ii:3*ii+3], byteorder='little', signed=True)
+    wavC_ref[ii % wavC_channels, ii // wavC_channels] = float(wavC_smpl / 2**23)
+
+wavC_stereo = waveio.pcm24Decode(wavC_bytes, wavC_channels)
+
+decodeErrorCnt = np.count_nonzero(wavC_stereo != wavC_ref)
+if decodeErrorCnt == 0:
+    print('\n24 bit decode matches the per-sample reference: '+wavfile_clone)
+else:
+    print('ERROR: 24 bit decode mismatch, sample error count = '+str(decodeErrorCnt))
+
+
+# 24 bit encode - vectorized pcm24Encode vs the per-sample int().to_bytes loop
+# (source + a full scale [-1.0, 1.0) noise burst)
+
+wavE_src = np.concatenate((wavA_stereo, np.random.default_rng(0).uniform(-1.0, 1.0, (wavA_channels, 4096))), axis=1)
+
+wavE_ref = bytearray([])
+for jj in range(wavE_src.shape[1]):
+    for kk in range(wavA_channels):
+        wavE_ref += int(wavE_src[kk, jj] * 2**23).to_bytes(3, byteorder='little', signed=True)
+
+wavE_bytes = waveio.pcm24Encode(wavE_src)
+
+if wavE_bytes == bytes(wavE_ref):
+    print('\n24 bit encode matches the per-sample reference')
+else:
+    encodeErrorCnt = np.count_nonzero(np.frombuffer(wavE_bytes, np.uint8) != np.frombuffer(wavE_ref, np.uint8))
+    print('ERROR: 24 bit encode mismatch, byte error count = '+str(encodeErrorCnt))
+
+# clone round trip - 24 bit samples survive wavWrite / wavRead unchanged
+wavC_read, wavC_readParam = tbWaveIO.wavRead(wavfile_clone, wavfile_dir)
+cloneErrorCnt = np.count_nonzero(wavC_read != wavA_stereo)
+if cloneErrorCnt == 0:
+    print('Successfully cloned: '+wavfile_A)
+else:
+    print('ERROR: cloning unsuccessful, sample error count = '+str(cloneErrorCnt))
+
+
+# // *---------------------------------------------------------------------* //
+
+print('\n')
+print('// *--------------------------------------------------------------* //')
+print('// *---::Resample .wav & verify length / streaming::---*')
+print('// *--------------------------------------------------------------* //')
+
+fsRS = 48000
+wavRS_length = (wavA_numSamples * fsRS + wavA_sampleRate - 1) // wavA_sampleRate
+
+wavRS_stereo = resamp.resample(wavA_stereo, wavA_sampleRate, fsRS)
+
+# stream the same input in uneven blocks through odmkResampler
+rsSplit = np.cumsum(np.resize([1, 17, 333, 4096], wavA_numSamples // 1000 + 1))
+rsSplit = rsSplit[rsSplit < wavA_numSamples]
+wavSRC = resamp.odmkResampler(wavA_sampleRate, fsRS)
+wavRS_stream = np.concatenate(list(wavSRC.stream(np.split(wavA_stereo, rsSplit, axis=1))), axis=1)
+
+# wavRead fsOut path
+wavRS_read, wavRS_param = tbWaveIO.wavRead(wavfile_A, audioScrDir, fsOut=fsRS)
+
+print('\n::((resampled '+wavfile_A+' '+str(wavA_sampleRate)+' => '+str(fsRS)+' Hz))::')
+print('expected length = '+str(wavRS_length))
+print('resample / stream / wavRead length = '+str(wavRS_stereo.shape[1])+' / '
+      +str(wavRS_stream.shape[1])+' / '+str(wavRS_param['fNumSamples']))
+
+if wavRS_stereo.shape[1] != wavRS_length or wavRS_stream.shape != wavRS_stereo.shape:
+    print('ERROR: resampled length mismatch')
+else:
+    print('streamed vs one-shot max error = '+str(np.abs(wavRS_stream - wavRS_stereo).max()))
+    print('wavRead(fsOut) vs one-shot max error = '+str(np.abs(wavRS_read - wavRS_stereo).max()))
+    if not np.allclose(wavRS_stream, wavRS_stereo, rtol=0, atol=1e-12):
+        print('ERROR: streamed resampler output differs from the one-shot output')
+
+# short streams (shorter than the filter delay) and empty input
+rsLengthErr = []
+for rsLen in range(0, 80):
+    for rsShape in ((rsLen,), (2, rsLen)):
+        rsOut = resamp.resample(np.zeros(rsShape), wavA_sampleRate, fsRS)
+        if rsOut.shape != rsShape[:-1] + ((rsLen * fsRS + wavA_sampleRate - 1) // wavA_sampleRate,):
+            rsLengthErr.append(rsShape)
+if rsLengthErr:
+    print('ERROR: short stream length mismatch for input shapes '+str(rsLengthErr))
+else:
+    print('short stream lengths (0 - 79 frames, mono / stereo) = ceil(n * '+str(fsRS)+' / '+str(wavA_sampleRate)+')')
+
+
 # // *---------------------------------------------------------------------* //
 
 print('\n')
@@ -256,7 +341,7 @@ print('generated array of orthogonal sin signals "orthoSinArray"')
 # ex. for cyclicZn(15), we want to use czn[1, 2, 3, ... 7]
 
 numOrthoFreq = 7
-czn = cyclicZn(2*numOrthoFreq + 1)
+czn = mathutil.cyclicZn(2*numOrthoFreq + 1)
 
 orthoFreqArray = np.array([])
 for c in range(1, numOrthoFreq+1):
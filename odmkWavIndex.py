@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header begin-----------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+# __::((odmkWavIndex.py))::__
+
+# persistent .wav header / metadata index for sample libraries
+#
+# the wavRead parameters (fSampleRate, fSampleBits, fChannels, fNumSamples),
+# the data chunk location and an optional peak / rms summary are stored in a
+# SQLite file keyed by path - entries are only re-parsed when the file mtime
+# or size changes, files that fail to parse are kept as marked rows (NULL
+# header fields) so they are not re-parsed until they change
+#
+# *****************************************************************************
+# /////////////////////////////////////////////////////////////////////////////
+# header end-------------------------------------------------------------------
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+# *****************************************************************************
+
+import os
+import struct
+import sqlite3
+import numpy as np
+
+import odmkWavIO as waveio
+import odmkWavBatch as wavbatch
+
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# begin : object definition
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\
+
+
+# header fields stored per file (all integers)
+wavIndexFields = ['fSampleRate', 'fSampleBits', 'fChannels', 'fNumSamples', 'fFormatTag',
+                  'fBlockAlign', 'fDataOffset', 'fDataSize']
+
+
+class odmkWavIndex:
+    ''' persistent .wav metadata index (SQLite)
+        usage: wavIdx = odmkWavIndex(indexFull)
+        wavIdx.scan(audioScrDir) => incremental (re-)index of a library
+        wavIdx.lookup(wavInFull) => wavRead parameter dict + fDataOffset,
+                                    fDataSize, fFormatTag, fBlockAlign and
+                                    wavPeak / wavRms (None if not summarized)
+        wavIdx.find(fSampleRate=48000, fChannels=2) => list of matching paths
+    '''
+
+    def __init__(self, indexFull):
+
+        self.indexFull = indexFull
+        self.wavDB = sqlite3.connect(indexFull)
+        self.wavDB.execute('CREATE TABLE IF NOT EXISTS wavIndex ('
+                           'path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, '
+                           + ', '.join(fld+' INTEGER' for fld in wavIndexFields) +
+                           ', wavPeak BLOB, wavRms BLOB)')
+        self.wavDB.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        self.wavDB.close()
+
+    # // *-----------------------------------------------------------------* //
+    # // *---index update
+    # // *-----------------------------------------------------------------* //
+
+    def wavIndexRow(self, wavInFull, wavStat, wavParam):
+        ''' build the table row of one file '''
+
+        wavRow = [wavInFull, wavStat.st_mtime_ns, wavStat.st_size]
+        wavRow += [int(wavParam[fld]) for fld in wavIndexFields]
+        for fld in ('wavPeak', 'wavRms'):
+            if fld in wavParam:
+                wavRow.append(np.asarray(wavParam[fld], dtype='<f8').tobytes())
+            else:
+                wavRow.append(None)
+        return wavRow
+
+    def wavIndexBadRow(self, wavInFull, wavStat):
+        ''' table row marking an unparseable file (NULL header / summary) '''
+
+        return [wavInFull, wavStat.st_mtime_ns, wavStat.st_size] + [None] * (len(wavIndexFields) + 2)
+
+    def wavIndexParse(self, wavInFull, wavStat):
+        ''' parse the header of one file
+            returns (table row, wavParam) - (marked row, None) if the file
+            can not be read or parsed '''
+
+        try:
+            wavParam = waveio.wavHeader(wavInFull)
+        except (ValueError, struct.error, OSError):
+            return self.wavIndexBadRow(wavInFull, wavStat), None
+        return self.wavIndexRow(wavInFull, wavStat, wavParam), wavParam
+
+    def scan(self, wavSrcDir, summary=False, recursive=True, nWorkers='None'):
+        ''' incrementally index every .wav file under wavSrcDir
+            only new files and files whose mtime / size changed are parsed,
+            entries of deleted files are removed, files that fail to parse
+            are marked (skipped by lookup / find) until they change
+            recursive => False indexes (and prunes) wavSrcDir itself only,
+                         entries of its subdirectories are left alone
+            summary => also compute per channel peak / rms - this reads the
+                       samples, so changed files are fanned out over a
+                       process pool (odmkWavBatch)
+            returns (nUpdated, nRemoved, nTotal) '''
+
+        wavSrcDir = os.path.abspath(wavSrcDir)
+        wavFiles = wavbatch.wavBatchList(wavSrcDir, recursive)
+
+        # cached (mtime, size, summarized, unparseable) of the files under
+        # wavSrcDir (directly in wavSrcDir when not recursive)
+        wavPrefix = os.path.join(wavSrcDir, '')
+        wavCached = {}
+        for wavInFull, mtime, size, wavPeak, fSampleRate in self.wavDB.execute(
+                'SELECT path, mtime, size, wavPeak, fSampleRate FROM wavIndex WHERE substr(path, 1, ?) = ?',
+                (len(wavPrefix), wavPrefix)):
+            if recursive or os.path.dirname(wavInFull) == wavSrcDir:
+                wavCached[wavInFull] = (mtime, size, wavPeak is not None, fSampleRate is None)
+
+        wavStale = []
+        wavStats = {}
+        for wavInFull in wavFiles:
+            try:
+                wavStat = os.stat(wavInFull)
+            except OSError:
+                # removed since the directory listing - pruned below
+                continue
+            wavStats[wavInFull] = wavStat
+            wavEntry = wavCached.get(wavInFull)
+            if (wavEntry is None or wavEntry[0] != wavStat.st_mtime_ns or wavEntry[1] != wavStat.st_size
+                    or (summary and not wavEntry[2] and not wavEntry[3])):
+                wavStale.append(wavInFull)
+
+        wavRows = []
+        if summary and wavStale:
+            wavReport = wavbatch.wavBatch(wavStale, wavbatch.wavAnalyzeJob, nWorkers=nWorkers, verbose=False)
+            for wavInFull, wavParam in wavReport['results'].items():
+                wavRows.append(self.wavIndexRow(wavInFull, wavStats[wavInFull], wavParam))
+            for wavInFull in wavReport['errors']:
+                wavRows.append(self.wavIndexBadRow(wavInFull, wavStats[wavInFull]))
+        else:
+            for wavInFull in wavStale:
+                wavRows.append(self.wavIndexParse(wavInFull, wavStats[wavInFull])[0])
+
+        wavRemoved = [(wavInFull,) for wavInFull in wavCached if wavInFull not in wavStats]
+
+        with self.wavDB:
+            self.wavDB.executemany('INSERT OR REPLACE INTO wavIndex VALUES ('
+                                   + ', '.join(['?'] * (5 + len(wavIndexFields))) + ')', wavRows)
+            self.wavDB.executemany('DELETE FROM wavIndex WHERE path = ?', wavRemoved)
+
+        return len(wavRows), len(wavRemoved), len(wavStats)
+
+    # // *-----------------------------------------------------------------* //
+    # // *---index query
+    # // *-----------------------------------------------------------------* //
+
+    def wavIndexParam(self, wavRow):
+        ''' convert a table row (without path / mtime / size) to a param dict '''
+
+        wavParam = dict(zip(wavIndexFields, wavRow[0:len(wavIndexFields)]))
+        for fld, wavBlob in zip(('wavPeak', 'wavRms'), wavRow[len(wavIndexFields):]):
+            wavParam[fld] = None if wavBlob is None else np.frombuffer(wavBlob, dtype='<f8')
+        return wavParam
+
+    def lookup(self, wavInFull, refresh=True):
+        ''' returns the indexed parameters of a file (None if the file is
+            not indexed or marked unparseable)
+            refresh => stat the file and re-parse the header if it changed
+            (the peak / rms summary of a changed file is dropped) - a file
+            that no longer exists is removed from the index, a file that
+            no longer parses is marked, both return None '''
+
+        wavInFull = os.path.abspath(wavInFull)
+        wavRow = self.wavDB.execute('SELECT mtime, size, '+', '.join(wavIndexFields)+', wavPeak, wavRms '
+                                    'FROM wavIndex WHERE path = ?', (wavInFull,)).fetchone()
+
+        if refresh:
+            try:
+                wavStat = os.stat(wavInFull)
+            except OSError:
+                if wavRow is not None:
+                    with self.wavDB:
+                        self.wavDB.execute('DELETE FROM wavIndex WHERE path = ?', (wavInFull,))
+                return None
+            if wavRow is None or wavRow[0] != wavStat.st_mtime_ns or wavRow[1] != wavStat.st_size:
+                wavIdxRow, wavParam = self.wavIndexParse(wavInFull, wavStat)
+                with self.wavDB:
+                    self.wavDB.execute('INSERT OR REPLACE INTO wavIndex VALUES ('
+                                       + ', '.join(['?'] * (5 + len(wavIndexFields))) + ')', wavIdxRow)
+                if wavParam is None:
+                    return None
+                wavParam['wavPeak'] = None
+                wavParam['wavRms'] = None
+                return wavParam
+        elif wavRow is None:
+            return None
+
+        if wavRow[2] is None:
+            return None
+        return self.wavIndexParam(wavRow[2:])
+
+    def find(self, **wavFields):
+        ''' returns the sorted paths whose header fields match all the
+            keyword values, ex. find(fSampleRate=48000, fSampleBits=24) '''
+
+        for fld in wavFields:
+            if fld not in wavIndexFields:
+                raise ValueError('odmkWavIndex.find: unknown field '+fld)
+
+        wavQuery = 'SELECT path FROM wavIndex WHERE fSampleRate IS NOT NULL'
+        if wavFields:
+            wavQuery += ' AND ' + ' AND '.join(fld+' = ?' for fld in wavFields)
+        wavQuery += ' ORDER BY path'
+
+        return [wavRow[0] for wavRow in self.wavDB.execute(wavQuery, tuple(wavFields.values()))]
+
+# /////////////////////////////////////////////////////////////////////////////
+# #############################################################################
+# end : object definition
+# #############################################################################
+# \\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\\